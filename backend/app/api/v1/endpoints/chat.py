@@ -1,6 +1,8 @@
-from typing import Any
+import json
+from typing import Any, Dict, Tuple
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from pydantic import BaseModel
@@ -32,6 +34,60 @@ async def chat_with_pursuit(
     """
     Chat with the AI about a specific pursuit.
     """
+    pursuit_context, rfp_text = await _load_chat_context(db, pursuit_id)
+
+    llm_service = LLMService()
+    agent = MetadataExtractionAgent(llm_service)
+
+    try:
+        response_text = await agent.chat(
+            message=chat_request.message,
+            pursuit_context=pursuit_context,
+            rfp_text=rfp_text,
+            user_id=str(current_user.id)
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
+
+    return ChatResponse(response=response_text)
+
+@router.post("/{pursuit_id}/chat/stream")
+async def chat_with_pursuit_stream(
+    *,
+    db: AsyncSession = Depends(get_db),
+    pursuit_id: UUID,
+    chat_request: ChatRequest,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Chat with the AI about a specific pursuit, streaming the reply as server-sent events.
+    Each event carries {"delta": "..."}; the stream ends with a "done" or "error" event.
+    """
+    pursuit_context, rfp_text = await _load_chat_context(db, pursuit_id)
+
+    llm_service = LLMService()
+    agent = MetadataExtractionAgent(llm_service)
+
+    async def event_stream():
+        try:
+            async for chunk in agent.chat_stream(
+                message=chat_request.message,
+                pursuit_context=pursuit_context,
+                rfp_text=rfp_text,
+                user_id=str(current_user.id)
+            ):
+                yield f"data: {json.dumps({'delta': chunk})}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'detail': f'Chat failed: {str(e)}'})}\n\n"
+            return
+        yield "event: done\ndata: {}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+async def _load_chat_context(db: AsyncSession, pursuit_id: UUID) -> Tuple[Dict[str, Any], str]:
+    """
+    Load the pursuit context and latest RFP text used by the chat endpoints.
+    """
     # 1. Get Pursuit
     result = await db.execute(select(Pursuit).where(Pursuit.id == pursuit_id))
     pursuit = result.scalars().first()
@@ -55,11 +111,7 @@ async def chat_with_pursuit(
             # If file read fails, we proceed with empty text, but log it
             pass
 
-    # 3. Initialize Agent
-    llm_service = LLMService()
-    agent = MetadataExtractionAgent(llm_service)
-
-    # 4. Prepare Context
+    # 3. Prepare Context
     pursuit_context = {
         "id": str(pursuit.id),
         "entity_name": pursuit.entity_name,
@@ -69,16 +121,4 @@ async def chat_with_pursuit(
         "technologies": pursuit.technologies,
         "metadata": pursuit.outline_json  # Assuming this is where we stored full extraction
     }
-
-    # 5. Chat
-    try:
-        response_text = await agent.chat(
-            message=chat_request.message,
-            pursuit_context=pursuit_context,
-            rfp_text=rfp_text,
-            user_id=str(current_user.id)
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Chat failed: {str(e)}")
-
-    return ChatResponse(response=response_text)
+    return pursuit_context, rfp_text
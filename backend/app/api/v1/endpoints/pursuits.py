@@ -8,6 +8,7 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+from sqlalchemy import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.orm import selectinload
@@ -354,6 +355,27 @@ async def trigger_gap_analysis(
 
     return pursuit
 
+@router.get("/{pursuit_id}/gap-analysis/status", response_model=pursuit_schemas.GapAnalysisStatus)
+async def read_gap_analysis_status(
+    *,
+    db: AsyncSession = Depends(get_db),
+    pursuit_id: UUID,
+    current_user: User = Depends(get_current_user),
+) -> Any:
+    """
+    Report whether a gap analysis result is available, without loading the pursuit.
+    Lets clients poll cheaply and fetch the full pursuit once it is ready.
+    """
+    # The column holds SQL NULL or a JSON null until a result is written
+    result = await db.execute(
+        select(func.coalesce(func.jsonb_typeof(Pursuit.gap_analysis_result), "null") != "null")
+        .where(Pursuit.id == pursuit_id)
+    )
+    ready = result.scalar_one_or_none()
+    if ready is None:
+        raise HTTPException(status_code=404, detail="Pursuit not found")
+    return {"ready": ready}
+
 @router.patch("/{pursuit_id}/gap-analysis", response_model=pursuit_schemas.Pursuit)
 async def update_gap_analysis(
     *,
@@ -30,6 +30,10 @@ class Settings(BaseSettings):
     BRAVE_API_KEY: str = ""
     LLM_MODEL_FAST: str = "claude-3-haiku-20240307"
     LLM_MODEL_SMART: str = "claude-3-haiku-20240307"
+    # Max estimated tokens of memory context included in a gap-analysis prompt
+    GAP_ANALYSIS_MEMORY_TOKEN_BUDGET: int = 1500
+    # Read timeout for calls to the LLM API over the shared connection pool
+    LLM_HTTP_TIMEOUT_SECONDS: float = 120.0
 
     # Vector DB - Optional for Railway (can use in-memory ChromaDB)
     CHROMADB_HOST: str = "localhost"
@@ -41,6 +45,20 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     REDIS_PRIVATE_URL: Optional[str] = None  # Railway private networking
 
+    # LLM response cache (exact match on the prompt, deterministic calls only)
+    LLM_CACHE_ENABLED: bool = True
+    LLM_CACHE_TTL_SECONDS: int = 86400
+    # Persistent second-level cache behind Redis; set to empty to disable. Defaults to the
+    # user cache dir so running from a checkout doesn't leave a database in the repo.
+    LLM_CACHE_DB_PATH: str = os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "pursuit", "llm_cache.sqlite3"
+    )
+    LLM_CACHE_DB_TTL_SECONDS: int = 604800
+
+    # Semantic cache for near-duplicate gap-analysis prompts (needs OPENAI_API_KEY for embeddings)
+    SEMANTIC_CACHE_ENABLED: bool = False
+    SEMANTIC_CACHE_THRESHOLD: float = 0.92
+
     @field_validator('DATABASE_URL', mode='before')
     @classmethod
     def convert_database_url(cls, v: str) -> str:
@@ -5,9 +5,11 @@ from app.api.v1.api import api_router
 from app.core.database import AsyncSessionLocal, engine, Base
 from app.models import User, Pursuit, PursuitFile, AuditLog
 from app.core.security import get_password_hash
+from app.services.ai_service.llm_service import close_http_client, close_redis_client
 from sqlalchemy.future import select
 
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
@@ -33,13 +35,34 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that never touches the chat SSE stream. Older Starlette releases
+    (still allowed by requirements) buffer and compress text/event-stream responses,
+    which would hold back every event until the reply completes.
+    """
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/chat/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress larger JSON responses (pursuits carry extraction and gap analysis payloads)
+app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=1024)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("shutdown")
+async def shutdown_clients():
+    await close_http_client()
+    await close_redis_client()
+
 @app.get("/")
 async def root():
     return {"message": "Pursuit Response Platform API is running"}
 
-@app.get("/health")
+# HEAD lets readiness probes check the service without transferring a body
+@app.api_route("/health", methods=["GET", "HEAD"])
 async def health_check():
     return {"status": "healthy"}
 
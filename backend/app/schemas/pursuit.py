@@ -57,6 +57,9 @@ class Pursuit(PursuitBase):
     class Config:
         from_attributes = True
 
+class GapAnalysisStatus(BaseModel):
+    ready: bool
+
 # Re-export PursuitMetadata for agent compatibility if needed, 
 # or we can just use PursuitBase/PursuitUpdate for the agent result.
 class PursuitMetadata(PursuitBase):
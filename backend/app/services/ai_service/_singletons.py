@@ -0,0 +1,29 @@
+"""
+Process-wide shared instances for scripts and other one-off callers.
+
+LLMService and MemoryService are expensive to construct (mem0 builds its vector store
+and LLM clients on init), so code that only needs "the" service in this process can
+reuse one instance instead of paying that cost per call site.
+"""
+import functools
+
+from app.services.ai_service.gap_analysis_agent import GapAnalysisAgent
+from app.services.ai_service.llm_service import LLMService
+from app.services.ai_service.metadata_agent import MetadataExtractionAgent
+from app.services.memory_service import MemoryService
+
+@functools.lru_cache(maxsize=1)
+def get_llm_service() -> LLMService:
+    return LLMService()
+
+@functools.lru_cache(maxsize=1)
+def get_memory_service() -> MemoryService:
+    return MemoryService()
+
+@functools.lru_cache(maxsize=1)
+def get_metadata_agent() -> MetadataExtractionAgent:
+    return MetadataExtractionAgent(get_llm_service(), memory_service=get_memory_service())
+
+@functools.lru_cache(maxsize=1)
+def get_gap_analysis_agent() -> GapAnalysisAgent:
+    return GapAnalysisAgent(get_llm_service(), memory_service=get_memory_service())
@@ -1,9 +1,14 @@
-from typing import Dict, Any, List
-import json
+from dataclasses import asdict, dataclass, fields
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+import asyncio
+import functools
+import hashlib
 import logging
+import orjson
 from pydantic import BaseModel, Field
 
 from app.services.memory_service import MemoryService
+from app.services.semantic_cache import SemanticCache
 from app.services.ai_service.llm_service import LLMService
 from app.core.config import settings
 
@@ -14,54 +19,207 @@ class GapAnalysisResult(BaseModel):
     search_queries: List[str] = Field(description="List of search queries to find missing information")
     reasoning: str = Field(description="Explanation of why these gaps were identified")
 
+@dataclass(frozen=True, slots=True)
+class PursuitSnapshot:
+    """
+    Fixed-shape, hashable view of the pursuit fields gap analysis works from.
+    """
+    id: Optional[str] = None
+    entity_name: Optional[str] = None
+    industry: Optional[str] = None
+    service_types: Tuple[str, ...] = ()
+    technologies: Tuple[str, ...] = ()
+    requirements_text: Optional[str] = None
+    submission_due_date: Optional[str] = None
+    estimated_fees_usd: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PursuitSnapshot":
+        """
+        Build a snapshot from a pursuit metadata dict. Unknown keys are ignored.
+        """
+        values = {f.name: data[f.name] for f in fields(cls) if data.get(f.name) is not None}
+        for name in ("service_types", "technologies"):
+            if name in values:
+                values[name] = tuple(values[name])
+        return cls(**values)
+
 class GapAnalysisAgent:
-    def __init__(self, llm_service: LLMService):
+    def __init__(
+        self,
+        llm_service: LLMService,
+        semantic_cache: Optional[SemanticCache] = None,
+        memory_service: Optional[MemoryService] = None
+    ):
         self.llm_service = llm_service
-        self.memory_service = MemoryService()
+        self.memory_service = memory_service or MemoryService()
+        if semantic_cache is None and settings.SEMANTIC_CACHE_ENABLED:
+            semantic_cache = SemanticCache("gap_analysis_cache")
+        self.semantic_cache = semantic_cache
+        # Memory searches currently running, shared by concurrent analyses with the same query
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    async def analyze_many(self, pursuits: List[Union[Dict[str, Any], PursuitSnapshot]], template_details: Dict[str, Any], user_id: str) -> List[Dict[str, Any]]:
+        """
+        Runs gap analysis for several pursuits against the same template concurrently.
+        Identical memory searches are issued once, and the shared template prefix is
+        served from the provider's prompt cache after the first call.
+        """
+        return await asyncio.gather(
+            *(self.analyze(pursuit_metadata, template_details, user_id) for pursuit_metadata in pursuits)
+        )
 
-    async def analyze(self, pursuit_metadata: Dict[str, Any], template_details: Dict[str, Any], user_id: str) -> Dict[str, Any]:
+    async def analyze(self, pursuit_metadata: Union[Dict[str, Any], PursuitSnapshot], template_details: Dict[str, Any], user_id: str) -> Dict[str, Any]:
         """
         Analyzes the gap between extracted metadata and the selected template.
         Retrieves relevant past information from memory to inform the analysis.
         """
-        logger.info(f"Starting gap analysis for pursuit: {pursuit_metadata.get('id')}")
+        pursuit = pursuit_metadata if isinstance(pursuit_metadata, PursuitSnapshot) else PursuitSnapshot.from_dict(pursuit_metadata)
+        logger.info(f"Starting gap analysis for pursuit: {pursuit.id}")
 
         # 1. Retrieve relevant context from memory (RAG)
         # We search for similar pursuits or past gap analyses
-        query = f"Gap analysis for {pursuit_metadata.get('entity_name', '')} {pursuit_metadata.get('industry', '')}"
-        memories = self.memory_service.search_long_term(query, user_id=user_id, limit=3)
+        query = f"Gap analysis for {pursuit.entity_name or ''} {pursuit.industry or ''}"
+        memories = await self._search_memory(query, user_id)
         
-        memory_context = ""
-        if memories:
-            memory_context = "\nRelevant past analyses/knowledge:\n"
-            for m in memories:
-                if isinstance(m, dict):
-                    text = m.get('memory', m.get('text', str(m)))
-                else:
-                    text = str(m)
-                memory_context += f"- {text}\n"
-            
+        memory_context = self._pack_memory_context(memories, settings.GAP_ANALYSIS_MEMORY_TOKEN_BUDGET)
+        if memory_context:
             logger.info(f"Retrieved Memory Context for Gap Analysis:\n{memory_context}")
 
         # 2. Construct Prompt
-        prompt = f"""
-        You are an expert proposal manager. Your task is to perform a Gap Analysis for a new pursuit.
-        
-        GOAL: Identify missing information in the "Extracted Metadata" that is required to fulfill the "Target Proposal Outline".
-        
-        INPUTS:
-        
-        1. Target Proposal Outline:
-        Title: {template_details.get('title')}
-        Description: {template_details.get('description')}
-        Structure:
-        {json.dumps(template_details.get('details', []), indent=2)}
+        # The template-dependent prefix is byte-identical across pursuits that share a
+        # template, so the provider can serve it from its prompt cache.
+        prompt_prefix = self._static_prefix(template_details)
+        prompt = self._dynamic_suffix(pursuit, memory_context)
         
+        # 3. Call LLM, unless a near-duplicate prompt for the same template was already answered.
+        # Results carry the user's memories and pursuit data, so the cache is scoped to the
+        # user and pursuit as well as the template.
+        cache_scope = hashlib.blake2b(
+            "\0".join((user_id, pursuit.id or "", prompt_prefix)).encode("utf-8"), digest_size=16
+        ).hexdigest()
+        try:
+            result_dict = None
+            if self.semantic_cache:
+                cached = await self.semantic_cache.lookup(prompt, scope=cache_scope)
+                if cached:
+                    result_dict = GapAnalysisResult.model_validate_json(cached).model_dump()
+
+            if result_dict is None:
+                result = await self.llm_service.generate_json(
+                    prompt=prompt,
+                    cached_prefix=prompt_prefix,
+                    schema=GapAnalysisResult,
+                    model=settings.LLM_MODEL_SMART
+                )
+                result_dict = result.model_dump()
+
+                if self.semantic_cache:
+                    cache_key = hashlib.blake2b((cache_scope + prompt).encode("utf-8"), digest_size=16).hexdigest()
+                    await self.semantic_cache.store(cache_key, prompt, result.model_dump_json(), scope=cache_scope)
+            
+            # 4. Store result in memory
+            try:
+                memory_text = f"Gap Analysis for {pursuit.entity_name}: Found {len(result_dict['gaps'])} gaps. Queries: {', '.join(result_dict['search_queries'][:3])}..."
+                await asyncio.to_thread(
+                    self.memory_service.add_long_term,
+                    memory_text, 
+                    user_id=user_id, 
+                    metadata={"type": "gap_analysis", "entity": pursuit.entity_name}
+                )
+            except Exception as e:
+                logger.error(f"Failed to store gap analysis memory: {e}")
+                
+            return result_dict
+            
+        except Exception as e:
+            logger.error(f"Gap analysis failed: {e}", exc_info=True)
+            raise e
+
+    async def _search_memory(self, query: str, user_id: str) -> List[Dict[str, Any]]:
+        """
+        Searches long-term memory off the event loop. Concurrent callers with the same
+        (user_id, query) await a single search instead of repeating it; the search is
+        shielded so a cancelled caller doesn't cancel it for the others.
+        """
+        key = (user_id, query)
+        search = self._inflight.get(key)
+        if search is None:
+            search = asyncio.ensure_future(
+                asyncio.to_thread(self.memory_service.search_long_term, query, user_id=user_id, limit=3)
+            )
+            self._inflight[key] = search
+            search.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(search)
+
+    def _pack_memory_context(self, memories: List[Any], budget_tokens: int) -> str:
+        """
+        Formats memory search results for the prompt, keeping records in relevance order
+        until the token budget is spent. Records that don't fit are skipped.
+        """
+        lines = []
+        used_tokens = 0
+        for m in memories or []:
+            if isinstance(m, dict):
+                text = m.get('memory', m.get('text', str(m)))
+            else:
+                text = str(m)
+            line = f"- {text}\n"
+            tokens = _estimate_tokens(line)
+            if used_tokens + tokens > budget_tokens:
+                logger.info(f"Skipping memory record of ~{tokens} tokens (budget {budget_tokens})")
+                continue
+            lines.append(line)
+            used_tokens += tokens
+
+        if not lines:
+            return ""
+        return "\nRelevant past analyses/knowledge:\n" + "".join(lines)
+
+    def _static_prefix(self, template_details: Dict[str, Any]) -> str:
+        """
+        Builds the part of the prompt that only depends on the template: role, instructions
+        and the target outline. Keys are sorted so the text is stable byte-for-byte.
+        """
+        title = template_details.get('title')
+        description = template_details.get('description')
+        details = template_details.get('details', [])
+        try:
+            return _render_static_prefix(title, description, tuple(details))
+        except TypeError:
+            # Outline sections that aren't hashable (e.g. dicts) can't be memoized
+            return _render_static_prefix.__wrapped__(title, description, details)
+
+    def _dynamic_suffix(self, pursuit: PursuitSnapshot, memory_context: str) -> str:
+        """
+        Builds the pursuit-specific part of the prompt, sent after the cached prefix.
+        """
+        return f"""
         2. Extracted Metadata (from RFP):
-        {json.dumps(pursuit_metadata, default=str, indent=2)}
+        {orjson.dumps(asdict(pursuit), default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()}
         
         3. Context (Past Knowledge):
         {memory_context}
+        """
+
+
+def _estimate_tokens(text: str) -> int:
+    """
+    Rough token count (~4 characters per token) used for prompt budgeting.
+    """
+    return len(text) // 4 + 1
+
+
+@functools.lru_cache(maxsize=256)
+def _render_static_prefix(title: Optional[str], description: Optional[str], details: Sequence[Any]) -> str:
+    """
+    Renders the template-dependent prompt prefix. Memoized because the same templates
+    are reused across many pursuits.
+    """
+    return f"""
+        You are an expert proposal manager. Your task is to perform a Gap Analysis for a new pursuit.
+        
+        GOAL: Identify missing information in the "Extracted Metadata" that is required to fulfill the "Target Proposal Outline".
         
         INSTRUCTIONS:
         - Compare the "Extracted Metadata" against the "Target Proposal Outline".
@@ -76,31 +234,12 @@ class GapAnalysisAgent:
             "search_queries": ["query 1", "query 2", ...],
             "reasoning": "Brief explanation of the analysis..."
         }}
-        """
         
-        # 3. Call LLM
-        try:
-            result = await self.llm_service.generate_json(
-                prompt=prompt,
-                schema=GapAnalysisResult,
-                model=settings.LLM_MODEL_SMART
-            )
-            
-            result_dict = result.model_dump()
-            
-            # 4. Store result in memory
-            try:
-                memory_text = f"Gap Analysis for {pursuit_metadata.get('entity_name')}: Found {len(result_dict['gaps'])} gaps. Queries: {', '.join(result_dict['search_queries'][:3])}..."
-                self.memory_service.add_long_term(
-                    memory_text, 
-                    user_id=user_id, 
-                    metadata={"type": "gap_analysis", "entity": pursuit_metadata.get('entity_name')}
-                )
-            except Exception as e:
-                logger.error(f"Failed to store gap analysis memory: {e}")
-                
-            return result_dict
-            
-        except Exception as e:
-            logger.error(f"Gap analysis failed: {e}", exc_info=True)
-            raise e
+        INPUTS:
+        
+        1. Target Proposal Outline:
+        Title: {title}
+        Description: {description}
+        Structure:
+        {orjson.dumps(list(details), option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()}
+        """
@@ -1,20 +1,105 @@
+import hashlib
 import logging
-from typing import Type, TypeVar
-from pydantic import BaseModel
-from anthropic import AsyncAnthropic
+from typing import AsyncIterator, Optional, Type, TypeVar
+import redis.asyncio as aioredis
+from pydantic import BaseModel, ValidationError
+from anthropic import AsyncAnthropic, DefaultAsyncHttpxClient, Timeout
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 from app.core.config import settings
+from app.services.ai_service.response_cache import PersistentResponseCache
 
 # Configure logger
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=BaseModel)
 
+# One connection pool per process, shared by every LLMService instance so that
+# request handlers and Celery tasks reuse keep-alive connections to the API.
+# The SDK's default client keeps its connection limits; we only add HTTP/2.
+_http_client: Optional[DefaultAsyncHttpxClient] = None
+
+def get_http_client() -> DefaultAsyncHttpxClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = DefaultAsyncHttpxClient(
+            http2=True,
+            timeout=Timeout(settings.LLM_HTTP_TIMEOUT_SECONDS, connect=5.0)
+        )
+    return _http_client
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+# The Redis response cache is shared the same way: one connection pool per process
+# instead of a new pool (and connection) for every LLMService.
+_redis_client: Optional[aioredis.Redis] = None
+
+def get_redis_client() -> Optional[aioredis.Redis]:
+    global _redis_client
+    if not settings.LLM_CACHE_ENABLED:
+        return None
+    if _redis_client is None:
+        _redis_client = aioredis.from_url(settings.REDIS_URL, decode_responses=True, socket_connect_timeout=2)
+    return _redis_client
+
+async def close_redis_client():
+    global _redis_client
+    if _redis_client is not None:
+        await _redis_client.aclose()
+        _redis_client = None
+
+# Likewise one persistent response store per process, so its schema setup and expiry
+# sweep run once rather than on the first cache access of every request.
+_response_store: Optional[PersistentResponseCache] = None
+
+def get_response_store() -> Optional[PersistentResponseCache]:
+    global _response_store
+    if not (settings.LLM_CACHE_ENABLED and settings.LLM_CACHE_DB_PATH):
+        return None
+    if _response_store is None:
+        _response_store = PersistentResponseCache(settings.LLM_CACHE_DB_PATH, settings.LLM_CACHE_DB_TTL_SECONDS)
+    return _response_store
+
 class LLMService:
     def __init__(self):
-        self.client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+        self.client = AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY, http_client=get_http_client())
         # Default to fast model, can be overridden
         self.model = settings.LLM_MODEL_FAST 
+        self.redis_client = get_redis_client()
+        self.response_store = get_response_store()
+        # generate_json results served from / missing the response cache, so callers
+        # and tests can tell whether a result came from the LLM
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    async def generate_json(self, prompt: str, schema: Type[T], model: str = None, cached_prefix: Optional[str] = None) -> T:
+        """
+        Generates a structured response from the LLM matching the provided Pydantic schema
+        using Anthropic's tool use capabilities.
+
+        These calls run at temperature 0, so identical requests are answered from the
+        response cache (Redis, then the persistent store) when possible.
+        """
+        target_model = model or self.model
+        cache_key = self._cache_key("json", target_model, schema.__name__, cached_prefix or "", prompt)
+
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            try:
+                result = schema.model_validate_json(cached)
+                logger.info(f"LLM cache hit for tool: {schema.__name__}")
+                self.cache_hits += 1
+                return result
+            except ValidationError:
+                logger.warning(f"Discarding stale LLM cache entry for tool: {schema.__name__}")
+
+        self.cache_misses += 1
+        result = await self._generate_json_uncached(prompt, schema, target_model, cached_prefix)
+        await self._cache_set(cache_key, result.model_dump_json())
+        return result
 
     @retry(
         stop=stop_after_attempt(3),
@@ -22,13 +107,13 @@ class LLMService:
         retry=retry_if_exception_type(Exception),
         reraise=True
     )
-    async def generate_json(self, prompt: str, schema: Type[T], model: str = None) -> T:
+    async def _generate_json_uncached(self, prompt: str, schema: Type[T], target_model: str, cached_prefix: Optional[str] = None) -> T:
         """
-        Generates a structured response from the LLM matching the provided Pydantic schema
-        using Anthropic's tool use capabilities.
-        Includes retry logic for transient errors.
+        Calls the LLM for generate_json. Includes retry logic for transient errors.
+
+        If cached_prefix is given it is sent ahead of the prompt with a prompt-caching
+        breakpoint, so repeated calls sharing that prefix skip re-processing it.
         """
-        target_model = model or self.model
         tool_name = schema.__name__
         tool_description = schema.__doc__ or f"Extract {tool_name} data"
         
@@ -41,6 +126,13 @@ class LLMService:
             "input_schema": input_schema
         }
 
+        content = prompt
+        if cached_prefix:
+            content = [
+                {"type": "text", "text": cached_prefix, "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt},
+            ]
+
         try:
             logger.info(f"Sending request to LLM ({target_model}) for tool: {tool_name}")
             
@@ -49,7 +141,7 @@ class LLMService:
                 max_tokens=4096,
                 system="You are a helpful AI assistant. Use the provided tool to extract the requested information.",
                 messages=[
-                    {"role": "user", "content": prompt}
+                    {"role": "user", "content": content}
                 ],
                 tools=[tool_definition],
                 tool_choice={"type": "tool", "name": tool_name},
@@ -102,3 +194,80 @@ class LLMService:
         except Exception as e:
             logger.error(f"Error calling LLM: {e}")
             raise e
+
+    async def generate_text_stream(self, prompt: str, system: str = None, model: str = None) -> AsyncIterator[str]:
+        """
+        Streams a free-form text response from the LLM, yielding text chunks as they are
+        generated. Not retried, since a partially consumed stream can't be replayed.
+        """
+        target_model = model or self.model
+        system_prompt = system or "You are a helpful AI assistant."
+
+        try:
+            logger.info(f"Streaming request to LLM ({target_model})")
+
+            async with self.client.messages.stream(
+                model=target_model,
+                max_tokens=4096,
+                system=system_prompt,
+                messages=[
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.7
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+        except Exception as e:
+            logger.error(f"Error streaming from LLM: {e}")
+            raise e
+
+    @staticmethod
+    def _cache_key(*parts: str) -> str:
+        digest = hashlib.blake2b("\x1e".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+        return f"llm:{parts[0]}:{parts[1]}:{digest}"
+
+    async def _cache_get(self, key: str) -> Optional[str]:
+        """
+        Read a cached LLM response from Redis, falling back to the persistent store (and
+        refilling Redis on a hit there). Cache failures are logged and treated as a miss.
+        """
+        if self.redis_client is not None:
+            try:
+                value = await self.redis_client.get(key)
+                if value is not None:
+                    return value
+            except Exception as e:
+                logger.warning(f"LLM cache read failed: {e}")
+
+        if self.response_store is None:
+            return None
+        try:
+            value = await self.response_store.get(key)
+        except Exception as e:
+            logger.warning(f"Persistent LLM cache read failed: {e}")
+            return None
+
+        if value is not None and self.redis_client is not None:
+            try:
+                await self.redis_client.setex(key, settings.LLM_CACHE_TTL_SECONDS, value)
+            except Exception as e:
+                logger.warning(f"LLM cache write failed: {e}")
+        return value
+
+    async def _cache_set(self, key: str, value: str):
+        """
+        Store an LLM response in Redis and the persistent store. Cache failures are logged
+        and otherwise ignored.
+        """
+        if self.redis_client is not None:
+            try:
+                await self.redis_client.setex(key, settings.LLM_CACHE_TTL_SECONDS, value)
+            except Exception as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+        if self.response_store is not None:
+            try:
+                await self.response_store.set(key, value)
+            except Exception as e:
+                logger.warning(f"Persistent LLM cache write failed: {e}")
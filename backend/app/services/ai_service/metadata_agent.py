@@ -1,5 +1,6 @@
-from typing import Dict, Any
-import json
+from typing import AsyncIterator, Dict, Any, Optional, Tuple
+import asyncio
+import orjson
 from app.schemas.pursuit import PursuitMetadata
 from app.services.memory_service import MemoryService
 
@@ -7,42 +8,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
-class MetadataExtractionAgent:
-    def __init__(self, llm_service):
-        self.llm_service = llm_service
-        self.memory_service = MemoryService()
-
-    async def extract(self, rfp_text: str, user_id: str = "agent_memory_user") -> Dict[str, Any]:
-        """
-        Extracts metadata from the provided RFP text using the LLM.
-        """
-        # 1. Retrieve relevant context from memory
-        # Use the first 1000 chars as query context
-        query = rfp_text[:1000]
-        memories = self.memory_service.search_long_term(query, user_id=user_id, limit=3)
+EXTRACTION_INSTRUCTIONS = """
+        You are an expert proposal manager. Your task is to extract key metadata from the Request for Proposal (RFP) text that follows.
         
-        memory_context = ""
-        if memories:
-            memory_context = "\nRelevant past extractions:\n"
-            for m in memories:
-                logger.info(f"Raw memory object: {m}")
-                if isinstance(m, dict):
-                    text = m.get('memory', m.get('text', str(m)))
-                else:
-                    text = str(m)
-                memory_context += f"- {text}\n"
-            
-            logger.info(f"Retrieved Memory Context:\n{memory_context}")
-
-        prompt = f"""
-        You are an expert proposal manager. Your task is to extract key metadata from the following Request for Proposal (RFP) text.
-        
-        CRITICAL INSTRUCTION: You have access to "Relevant past extractions" which contain user feedback and corrections. 
+        CRITICAL INSTRUCTION: You may be given "Relevant past extractions" which contain user feedback and corrections. 
         If the RFP text contradicts the "Relevant past extractions", YOU MUST PRIORITIZE THE PAST EXTRACTIONS/FEEDBACK. 
         For example, if the RFP says the due date is Jan 15, but feedback says it was extended to Feb 28, use Feb 28.
         
-        {memory_context}
-        
         Please extract the following fields:
         - entity_name: Client organization name
         - client_pursuit_owner_name: Name of the client contact
@@ -55,10 +27,39 @@ class MetadataExtractionAgent:
         - rfp_objective: Summary of the client's main goal or objective
         - requirements: List of specific requirements mentioned in the RFP. MUST be a JSON list. Return [] if none found.
         - sources: List of references to where information was found (e.g., "Page 5, Section 2.1")
+        """
+
+class MetadataExtractionAgent:
+    def __init__(self, llm_service, memory_service: Optional[MemoryService] = None):
+        self.llm_service = llm_service
+        self.memory_service = memory_service or MemoryService()
+
+    async def extract(self, rfp_text: str, user_id: str = "agent_memory_user") -> Dict[str, Any]:
+        """
+        Extracts metadata from the provided RFP text using the LLM.
+        """
+        # 1. Retrieve relevant context from memory
+        # Use the first 1000 chars as query context
+        query = rfp_text[:1000]
+        # mem0 calls are blocking network/LLM round trips, so they run off the event loop
+        memories = await asyncio.to_thread(self.memory_service.search_long_term, query, user_id=user_id, limit=3)
         
+        memory_context = self._format_memories("Relevant past extractions", memories)
+        if memory_context:
+            logger.info(f"Retrieved Memory Context:\n{memory_context}")
+
+        # Instructions and the RFP text form a fixed prefix the provider can cache, so
+        # re-extracting the same RFP (e.g. after feedback) only processes the memory
+        # context that changed since the last call.
+        cached_prefix = f"""{EXTRACTION_INSTRUCTIONS}
         RFP TEXT:
         {rfp_text}
         """
+        prompt = f"""
+        {memory_context}
+        
+        Extract the metadata from the RFP text above.
+        """
         
         # The LLM service uses tool use to enforce the Pydantic schema structure
         # Use the smart model (Sonnet) for better extraction quality
@@ -66,6 +67,7 @@ class MetadataExtractionAgent:
         
         response = await self.llm_service.generate_json(
             prompt=prompt,
+            cached_prefix=cached_prefix,
             schema=PursuitMetadata,
             model=settings.LLM_MODEL_SMART
         )
@@ -77,8 +79,9 @@ class MetadataExtractionAgent:
         # 2. Store the result in memory for future reference
         try:
             # Store a summary or the full JSON
-            memory_text = f"Extracted metadata for {result.get('entity_name', 'Unknown Entity')}: {json.dumps(result, default=str)}"
-            self.memory_service.add_long_term(
+            memory_text = f"Extracted metadata for {result.get('entity_name', 'Unknown Entity')}: {orjson.dumps(result, default=str).decode()}"
+            await asyncio.to_thread(
+                self.memory_service.add_long_term,
                 memory_text, 
                 user_id=user_id, 
                 metadata={"type": "metadata_extraction", "entity": result.get('entity_name')}
@@ -93,18 +96,46 @@ class MetadataExtractionAgent:
         """
         Chat with the agent about a specific pursuit.
         """
+        system_prompt, prompt = await self._build_chat_prompt(message, pursuit_context, rfp_text, user_id)
+
+        # 3. Generate Response
+        from app.core.config import settings
+        response = await self.llm_service.generate_text(
+            prompt=prompt,
+            system=system_prompt,
+            model=settings.LLM_MODEL_SMART
+        )
+
+        await self._store_chat_turn(pursuit_context, message, response)
+        return response
+
+    async def chat_stream(self, message: str, pursuit_context: Dict[str, Any], rfp_text: str = "", user_id: str = "agent_memory_user") -> AsyncIterator[str]:
+        """
+        Same as chat(), but yields the response in chunks as the LLM generates it.
+        The full response is stored in memory once the stream completes.
+        """
+        system_prompt, prompt = await self._build_chat_prompt(message, pursuit_context, rfp_text, user_id)
+
+        from app.core.config import settings
+        chunks = []
+        async for chunk in self.llm_service.generate_text_stream(
+            prompt=prompt,
+            system=system_prompt,
+            model=settings.LLM_MODEL_SMART
+        ):
+            chunks.append(chunk)
+            yield chunk
+
+        await self._store_chat_turn(pursuit_context, message, "".join(chunks))
+
+    async def _build_chat_prompt(self, message: str, pursuit_context: Dict[str, Any], rfp_text: str, user_id: str) -> Tuple[str, str]:
+        """
+        Returns the (system prompt, user prompt) pair for a chat turn.
+        """
         # 1. Retrieve relevant context from memory
-        memories = self.memory_service.search_long_term(message, user_id=user_id, limit=3)
+        memories = await asyncio.to_thread(self.memory_service.search_long_term, message, user_id=user_id, limit=3)
         
-        memory_context = ""
-        if memories:
-            memory_context = "\nRelevant past interactions/knowledge:\n"
-            for m in memories:
-                if isinstance(m, dict):
-                    text = m.get('memory', m.get('text', str(m)))
-                else:
-                    text = str(m)
-                memory_context += f"- {text}\n"
+        memory_context = self._format_memories("Relevant past interactions/knowledge", memories)
 
         # 2. Construct Prompt
         system_prompt = """You are an expert proposal manager assisting a user with a pursuit. 
@@ -115,7 +146,7 @@ class MetadataExtractionAgent:
 
         prompt = f"""
         CONTEXT:
-        Pursuit Metadata: {json.dumps(pursuit_context, default=str)}
+        Pursuit Metadata: {orjson.dumps(pursuit_context, default=str).decode()}
         
         {memory_context}
         
@@ -125,21 +156,31 @@ class MetadataExtractionAgent:
         USER MESSAGE:
         {message}
         """
+        return system_prompt, prompt
 
-        # 3. Generate Response
-        from app.core.config import settings
-        response = await self.llm_service.generate_text(
-            prompt=prompt,
-            system=system_prompt,
-            model=settings.LLM_MODEL_SMART
-        )
+    def _format_memories(self, header: str, memories) -> str:
+        """
+        Render memory search results as a bulleted prompt section, built in a single join.
+        """
+        if not memories:
+            return ""
+        parts = [f"\n{header}:\n"]
+        for m in memories:
+            logger.debug(f"Raw memory object: {m}")
+            if isinstance(m, dict):
+                text = m.get('memory', m.get('text', str(m)))
+            else:
+                text = str(m)
+            parts.append(f"- {text}\n")
+        return "".join(parts)
 
-        # 4. Store interaction in memory
+    async def _store_chat_turn(self, pursuit_context: Dict[str, Any], message: str, response: str):
+        """
+        Store the chat interaction in short-term memory.
+        """
         try:
             pursuit_id = str(pursuit_context.get("id"))
-            self.memory_service.add_short_term(pursuit_id, "user", message)
-            self.memory_service.add_short_term(pursuit_id, "assistant", response)
+            await asyncio.to_thread(self.memory_service.add_short_term, pursuit_id, "user", message)
+            await asyncio.to_thread(self.memory_service.add_short_term, pursuit_id, "assistant", response)
         except Exception as e:
             logger.error(f"Failed to store chat memory: {e}")
-
-        return response
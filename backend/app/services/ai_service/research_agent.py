@@ -7,7 +7,7 @@ to find relevant information, then extracts and summarizes the findings using Cl
 
 import logging
 import asyncio
-import json
+import orjson
 from typing import List, Dict, Any, Optional
 import aiohttp
 from pydantic import BaseModel, Field
@@ -259,9 +259,9 @@ Return ONLY the JSON object, no other text.
             )
 
             # Parse JSON response
-            result = json.loads(response_text)
+            result = orjson.loads(response_text)
             return result
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Error parsing JSON from LLM response: {e}")
             logger.error(f"Response was: {response_text}")
             return None
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+class PersistentResponseCache:
+    """
+    SQLite-backed store for LLM responses that survives process restarts and Redis flushes.
+    Sits behind the Redis cache in LLMService; entries older than the TTL are ignored and
+    swept the first time the file is opened by a process.
+    """
+    def __init__(self, path: str, ttl_seconds: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._initialized = False
+
+    async def get(self, key: str) -> Optional[str]:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: str):
+        await asyncio.to_thread(self._set, key, value)
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            # sqlite3 won't create missing parent directories, and the cache directory
+            # is not checked in
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_response_cache "
+                "(key TEXT PRIMARY KEY, response TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_response_cache_created_at ON llm_response_cache (created_at)")
+            conn.execute("DELETE FROM llm_response_cache WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _get(self, key: str) -> Optional[str]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT response FROM llm_response_cache WHERE key = ? AND created_at >= ?",
+                (key, time.time() - self.ttl_seconds)
+            ).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    def _set(self, key: str, value: str):
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_response_cache (key, response, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            conn.commit()
+        finally:
+            conn.close()
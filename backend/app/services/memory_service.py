@@ -1,4 +1,4 @@
-import json
+import orjson
 import logging
 from typing import List, Dict, Any, Optional
 import redis
@@ -45,8 +45,8 @@ class MemoryService:
         """
         try:
             try:
-                message = json.dumps({"role": role, "content": content})
-            except TypeError:
+                message = orjson.dumps({"role": role, "content": content}).decode()
+            except orjson.JSONEncodeError:
                 logger.error(f"Failed to serialize message content for session {session_id}")
                 return
 
@@ -66,7 +66,7 @@ class MemoryService:
             key = f"session:{session_id}:history"
             # Get last 'limit' messages
             messages = self.redis_client.lrange(key, -limit, -1)
-            return [json.loads(msg) for msg in messages]
+            return [orjson.loads(msg) for msg in messages]
         except Exception as e:
             logger.error(f"Error getting short-term memory: {e}", exc_info=True)
             return []
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Optional
+import chromadb
+from chromadb.utils.embedding_functions import OpenAIEmbeddingFunction
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    Reuses earlier LLM results for prompts that are near-duplicates of a previous one.
+    Prompts are embedded with OpenAI and compared by cosine similarity in ChromaDB.
+    """
+    def __init__(self, collection_name: str, threshold: float = None, collection=None):
+        self.threshold = threshold if threshold is not None else settings.SEMANTIC_CACHE_THRESHOLD
+        self.collection = collection or self._get_collection(collection_name)
+
+    @staticmethod
+    def _get_collection(collection_name: str):
+        if settings.USE_CHROMA_SERVER:
+            client = chromadb.HttpClient(host=settings.CHROMADB_HOST, port=settings.CHROMADB_PORT)
+        else:
+            client = chromadb.PersistentClient(path=settings.CHROMA_PERSIST_DIR)
+
+        return client.get_or_create_collection(
+            name=collection_name,
+            embedding_function=OpenAIEmbeddingFunction(
+                api_key=settings.OPENAI_API_KEY,
+                model_name="text-embedding-3-small"
+            ),
+            metadata={"hnsw:space": "cosine"}
+        )
+
+    async def lookup(self, text: str, scope: str) -> Optional[str]:
+        """
+        Return the cached value for the most similar text within scope, or None if nothing
+        is similar enough. Failures are logged and treated as a miss.
+        """
+        try:
+            results = await asyncio.to_thread(
+                self.collection.query,
+                query_texts=[text],
+                n_results=1,
+                where={"scope": scope},
+                include=["metadatas", "distances"]
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache lookup failed: {e}")
+            return None
+
+        if not results or not results.get("ids") or not results["ids"][0]:
+            return None
+
+        # Chroma returns cosine distance; similarity = 1 - distance
+        similarity = 1 - results["distances"][0][0]
+        if similarity < self.threshold:
+            return None
+
+        logger.info(f"Semantic cache hit (similarity {similarity:.3f}) in scope {scope}")
+        return results["metadatas"][0][0].get("value")
+
+    async def store(self, key: str, text: str, value: str, scope: str):
+        """
+        Store value under the embedding of text. Failures are logged and otherwise ignored.
+        """
+        try:
+            await asyncio.to_thread(
+                self.collection.upsert,
+                ids=[key],
+                documents=[text],
+                metadatas=[{"scope": scope, "value": value}]
+            )
+        except Exception as e:
+            logger.warning(f"Semantic cache store failed: {e}")
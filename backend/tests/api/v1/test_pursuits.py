@@ -5,6 +5,8 @@ from app.models.user import User
 
 # Tests use db_user fixture which handles auth override
 
+RFP_CONTENT = b"This is a test RFP content."
+
 @pytest.mark.asyncio
 async def test_create_pursuit(async_client: AsyncClient, db_user: User):
     payload = {
@@ -46,7 +48,7 @@ async def test_upload_file(async_client: AsyncClient, db_user: User):
     pursuit_id = res.json()["id"]
 
     # Upload file
-    files = {'file': ('test.txt', b'This is a test RFP content.', 'text/plain')}
+    files = {'file': ('test.txt', RFP_CONTENT, 'text/plain')}
     data = {'file_type': 'rfp'}
     
     response = await async_client.post(
@@ -74,3 +76,57 @@ async def test_extract_metadata(async_client: AsyncClient, db_user: User):
     # We accept 200 (success) or 500 (likely LLM error in test env)
     # The goal is to verify the endpoint routing and logic flow up to the agent call.
     assert response.status_code in [200, 500]
+
+@pytest.mark.asyncio
+async def test_gap_analysis_status(async_client: AsyncClient, db_user: User):
+    res = await async_client.post("/api/v1/pursuits/", json={"entity_name": "Test Status", "expected_format": "docx"})
+    pursuit_id = res.json()["id"]
+
+    response = await async_client.get(f"/api/v1/pursuits/{pursuit_id}/gap-analysis/status")
+    assert response.status_code == 200
+    assert response.json() == {"ready": False}
+
+    await async_client.patch(f"/api/v1/pursuits/{pursuit_id}/gap-analysis", json={"gaps": ["Pricing"], "search_queries": []})
+    response = await async_client.get(f"/api/v1/pursuits/{pursuit_id}/gap-analysis/status")
+    assert response.json() == {"ready": True}
+
+@pytest.mark.asyncio
+async def test_gap_analysis_status_not_found(async_client: AsyncClient, db_user: User):
+    response = await async_client.get("/api/v1/pursuits/00000000-0000-0000-0000-000000000000/gap-analysis/status")
+    assert response.status_code == 404
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped(async_client: AsyncClient, db_user: User):
+    payload = {"entity_name": "Test Gzip", "expected_format": "docx", "requirements_text": "Requirement. " * 200}
+    res = await async_client.post("/api/v1/pursuits/", json=payload)
+    pursuit_id = res.json()["id"]
+
+    response = await async_client.get(f"/api/v1/pursuits/{pursuit_id}", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json()["requirements_text"] == payload["requirements_text"]
+
+@pytest.mark.asyncio
+async def test_chat_stream_is_not_gzipped(async_client: AsyncClient, db_user: User, monkeypatch):
+    class StreamingAgent:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        async def chat_stream(self, **kwargs):
+            for _ in range(50):
+                yield "A long streamed reply chunk. "
+
+    monkeypatch.setattr("app.api.v1.endpoints.chat.LLMService", lambda: None)
+    monkeypatch.setattr("app.api.v1.endpoints.chat.MetadataExtractionAgent", StreamingAgent)
+    res = await async_client.post("/api/v1/pursuits/", json={"entity_name": "Test Stream", "expected_format": "docx"})
+    pursuit_id = res.json()["id"]
+
+    response = await async_client.post(
+        f"/api/v1/pursuits/{pursuit_id}/chat/stream",
+        json={"message": "Summarize the RFP"},
+        headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert "content-encoding" not in response.headers
+    assert "event: done" in response.text
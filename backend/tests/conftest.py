@@ -1,18 +1,33 @@
+import os
+import sys
+from pathlib import Path
+
 import pytest
-from httpx import AsyncClient, ASGITransport
 import asyncio
 
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import NullPool
 
+# Make `app` importable however pytest is invoked (repo root, backend/, or the container)
+BACKEND_DIR = str(Path(__file__).resolve().parent.parent)
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
 from app.main import app
 from app.core.config import settings
 from app.core.database import Base, get_db
 # Import models
 from app.models import user, pursuit, pursuit_file, audit_log
+from app.services.ai_service import llm_service as llm_service_module
+
+# Under pytest-xdist (`pytest -n auto --dist=loadfile`) every worker gets its own
+# schema so the per-test drop_all/create_all cycles don't race each other.
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER")
+TEST_SCHEMA = f"test_{XDIST_WORKER}" if XDIST_WORKER else None
 
 # Create a test engine with NullPool to avoid connection sharing issues
 test_engine = create_async_engine(
@@ -20,6 +35,7 @@ test_engine = create_async_engine(
     echo=False,
     future=True,
     poolclass=NullPool,
+    connect_args={"server_settings": {"search_path": TEST_SCHEMA}} if TEST_SCHEMA else {},
 )
 
 TestingSessionLocal = sessionmaker(
@@ -48,6 +64,8 @@ async def init_db():
     app.dependency_overrides[get_db] = override_get_db
     
     async with test_engine.begin() as conn:
+        if TEST_SCHEMA:
+            await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {TEST_SCHEMA}"))
         await conn.run_sync(Base.metadata.drop_all)
         await conn.run_sync(Base.metadata.create_all)
     
@@ -58,6 +76,44 @@ async def init_db():
     
     app.dependency_overrides.pop(get_db, None)
 
+@pytest.fixture(autouse=True)
+def llm_cache_db(tmp_path, monkeypatch):
+    # Point the persistent LLM response cache at a per-test file instead of the user
+    # cache dir, and drop any store a previous test created
+    monkeypatch.setattr(settings, "LLM_CACHE_DB_PATH", str(tmp_path / "llm_cache.sqlite3"))
+    monkeypatch.setattr(llm_service_module, "_response_store", None)
+
+class FakeMemoryService:
+    """
+    In-memory stand-in for MemoryService, injected into agents so unit tests don't
+    need mem0, Redis or patching.
+    """
+    def __init__(self):
+        self.search_results = []
+        self.searches = []
+        self.long_term = []
+        self.short_term = {}
+
+    def add_long_term(self, item, user_id, metadata=None):
+        self.long_term.append({"text": item, "user_id": user_id, "metadata": metadata})
+
+    def search_long_term(self, query, user_id, limit=5):
+        self.searches.append({"query": query, "user_id": user_id, "limit": limit})
+        return list(self.search_results[:limit])
+
+    def add_short_term(self, session_id, role, content):
+        self.short_term.setdefault(session_id, []).append({"role": role, "content": content})
+
+    def get_short_term(self, session_id, limit=10):
+        return self.short_term.get(session_id, [])[-limit:]
+
+    def clear_short_term(self, session_id):
+        self.short_term.pop(session_id, None)
+
+@pytest.fixture
+def fake_memory_service():
+    return FakeMemoryService()
+
 @pytest_asyncio.fixture
 async def async_client():
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
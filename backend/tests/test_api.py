@@ -7,6 +7,12 @@ async def test_health_check(async_client: AsyncClient):
     assert response.status_code == 200
     assert response.json() == {"status": "healthy"}
 
+@pytest.mark.anyio
+async def test_health_check_head(async_client: AsyncClient):
+    response = await async_client.head("/health")
+    assert response.status_code == 200
+    assert response.content == b""
+
 @pytest.mark.anyio
 async def test_root(async_client: AsyncClient):
     response = await async_client.get("/")
@@ -1,26 +1,36 @@
+import asyncio
+import threading
+
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
-from app.services.ai_service.gap_analysis_agent import GapAnalysisAgent, GapAnalysisResult
+from unittest.mock import AsyncMock, Mock
+from app.services.ai_service.gap_analysis_agent import GapAnalysisAgent, GapAnalysisResult, PursuitSnapshot
 from app.services.ai_service.llm_service import LLMService
 
-@pytest.fixture
-def mock_llm_service():
-    return AsyncMock(spec=LLMService)
+# Shared LLM results, validated once at import instead of in every test
+ACME_RESULT = GapAnalysisResult(
+    gaps=["Pricing Model", "Team Structure"],
+    search_queries=["Acme Corp pricing model", "Acme Corp team structure"],
+    reasoning="Missing pricing and team info."
+)
+STARTUP_RESULT = GapAnalysisResult(
+    gaps=["Gap 1"],
+    search_queries=["Query 1"],
+    reasoning="Reasoning 1"
+)
 
 @pytest.fixture
-def mock_memory_service():
-    with patch("app.services.ai_service.gap_analysis_agent.MemoryService") as MockMemoryService:
-        mock_instance = MockMemoryService.return_value
-        mock_instance.search_long_term = MagicMock(return_value=[])
-        mock_instance.add_long_term = MagicMock()
-        yield mock_instance
+def mock_llm_service():
+    service = Mock(spec=LLMService)
+    service.generate_json = AsyncMock()
+    service.generate_text = AsyncMock()
+    return service
 
 @pytest.fixture
-def agent(mock_llm_service, mock_memory_service):
-    return GapAnalysisAgent(mock_llm_service)
+def agent(mock_llm_service, fake_memory_service):
+    return GapAnalysisAgent(mock_llm_service, memory_service=fake_memory_service)
 
 @pytest.mark.asyncio
-async def test_analyze_success(agent, mock_llm_service, mock_memory_service):
+async def test_analyze_success(agent, mock_llm_service, fake_memory_service):
     # Setup inputs
     pursuit_metadata = {
         "id": "123",
@@ -37,15 +47,10 @@ async def test_analyze_success(agent, mock_llm_service, mock_memory_service):
     user_id = "user123"
 
     # Setup mocks
-    expected_result = GapAnalysisResult(
-        gaps=["Pricing Model", "Team Structure"],
-        search_queries=["Acme Corp pricing model", "Acme Corp team structure"],
-        reasoning="Missing pricing and team info."
-    )
-    mock_llm_service.generate_json.return_value = expected_result
+    mock_llm_service.generate_json.return_value = ACME_RESULT
     
     # Mock memory retrieval to return some context
-    mock_memory_service.search_long_term.return_value = [
+    fake_memory_service.search_results = [
         {"memory": "Past analysis for Acme Corp showed need for security compliance."}
     ]
 
@@ -59,28 +64,24 @@ async def test_analyze_success(agent, mock_llm_service, mock_memory_service):
     # Verify LLM call
     mock_llm_service.generate_json.assert_called_once()
     call_args = mock_llm_service.generate_json.call_args
-    assert "Acme Corp" in call_args.kwargs["prompt"]
-    assert "Standard Proposal" in call_args.kwargs["prompt"]
+    full_prompt = call_args.kwargs["cached_prefix"] + call_args.kwargs["prompt"]
+    assert "Acme Corp" in full_prompt
+    assert "Standard Proposal" in call_args.kwargs["cached_prefix"]
     assert "Past analysis for Acme Corp" in call_args.kwargs["prompt"] # Verify RAG context usage
 
     # Verify Memory storage
-    mock_memory_service.add_long_term.assert_called_once()
+    assert len(fake_memory_service.long_term) == 1
     
 @pytest.mark.asyncio
-async def test_analyze_no_memory(agent, mock_llm_service, mock_memory_service):
+async def test_analyze_no_memory(agent, mock_llm_service, fake_memory_service):
     # Setup inputs
     pursuit_metadata = {"entity_name": "Startup Inc"}
     template_details = {"title": "Simple Template"}
     user_id = "user456"
 
     # Setup mocks
-    expected_result = GapAnalysisResult(
-        gaps=["Gap 1"],
-        search_queries=["Query 1"],
-        reasoning="Reasoning 1"
-    )
-    mock_llm_service.generate_json.return_value = expected_result
-    mock_memory_service.search_long_term.return_value = [] # No memory found
+    mock_llm_service.generate_json.return_value = STARTUP_RESULT
+    fake_memory_service.search_results = [] # No memory found
 
     # Execute
     result = await agent.analyze(pursuit_metadata, template_details, user_id)
@@ -92,6 +93,162 @@ async def test_analyze_no_memory(agent, mock_llm_service, mock_memory_service):
     call_args = mock_llm_service.generate_json.call_args
     assert "Relevant past analyses/knowledge" not in call_args.kwargs["prompt"] or "Relevant past analyses/knowledge:\n\n" in call_args.kwargs["prompt"]
 
+@pytest.mark.asyncio
+async def test_analyze_prompt_prefix_is_stable(agent, mock_llm_service):
+    # Two different pursuits using the same template must share a byte-identical prefix
+    template_details = {
+        "title": "Standard Proposal",
+        "description": "A standard proposal template",
+        "details": ["Executive Summary", "Technical Approach", "Pricing"]
+    }
+    mock_llm_service.generate_json.return_value = STARTUP_RESULT
+
+    await agent.analyze({"entity_name": "Acme Corp", "industry": "Technology"}, template_details, "user1")
+    await agent.analyze({"entity_name": "Startup Inc", "industry": "Retail"}, dict(template_details), "user2")
+
+    first, second = mock_llm_service.generate_json.call_args_list
+    assert first.kwargs["cached_prefix"] == second.kwargs["cached_prefix"]
+    assert "Acme Corp" not in second.kwargs["cached_prefix"]
+    assert first.kwargs["prompt"] != second.kwargs["prompt"]
+
+def test_pursuit_snapshot_from_dict():
+    snapshot = PursuitSnapshot.from_dict({
+        "id": "123",
+        "entity_name": "Acme Corp",
+        "industry": None,
+        "service_types": ["Software Development"],
+        "unknown_field": "ignored"
+    })
+
+    assert snapshot.entity_name == "Acme Corp"
+    assert snapshot.industry is None
+    assert snapshot.service_types == ("Software Development",)
+    assert snapshot == PursuitSnapshot.from_dict({"id": "123", "entity_name": "Acme Corp", "service_types": ["Software Development"]})
+    assert hash(snapshot)
+
+def test_pack_memory_context_respects_token_budget(agent):
+    memories = [
+        {"memory": "Short relevant note."},
+        {"memory": "x" * 400},
+        "Another short note.",
+    ]
+
+    context = agent._pack_memory_context(memories, budget_tokens=20)
+
+    assert "Short relevant note." in context
+    assert "Another short note." in context
+    assert "x" * 400 not in context
+    assert agent._pack_memory_context([], budget_tokens=20) == ""
+
+def test_static_prefix_handles_unhashable_outline(agent):
+    template_details = {
+        "title": "Standard Proposal",
+        "details": [{"section": "Pricing", "required": True}]
+    }
+
+    prefix = agent._static_prefix(template_details)
+
+    assert '"section": "Pricing"' in prefix
+    assert prefix == agent._static_prefix(dict(template_details))
+
+@pytest.mark.asyncio
+async def test_analyze_semantic_cache_hit_skips_llm(mock_llm_service, fake_memory_service):
+    semantic_cache = Mock()
+    semantic_cache.lookup = AsyncMock(return_value=ACME_RESULT.model_dump_json())
+    semantic_cache.store = AsyncMock()
+    agent = GapAnalysisAgent(mock_llm_service, semantic_cache=semantic_cache, memory_service=fake_memory_service)
+
+    result = await agent.analyze({"entity_name": "Acme Corp"}, {"title": "Standard Proposal"}, "user1")
+
+    assert result["gaps"] == ACME_RESULT.gaps
+    mock_llm_service.generate_json.assert_not_called()
+    semantic_cache.store.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_analyze_semantic_cache_miss_stores_result(mock_llm_service, fake_memory_service):
+    semantic_cache = Mock()
+    semantic_cache.lookup = AsyncMock(return_value=None)
+    semantic_cache.store = AsyncMock()
+    agent = GapAnalysisAgent(mock_llm_service, semantic_cache=semantic_cache, memory_service=fake_memory_service)
+    mock_llm_service.generate_json.return_value = ACME_RESULT
+
+    await agent.analyze({"entity_name": "Acme Corp"}, {"title": "Standard Proposal"}, "user1")
+
+    mock_llm_service.generate_json.assert_called_once()
+    semantic_cache.store.assert_called_once()
+    assert semantic_cache.store.call_args.kwargs["scope"] == semantic_cache.lookup.call_args.kwargs["scope"]
+
+class ExactMatchCache:
+    """
+    In-memory stand-in for SemanticCache that only hits on an identical prompt in the same scope.
+    """
+    def __init__(self):
+        self.entries = {}
+
+    async def lookup(self, text, scope):
+        return self.entries.get((scope, text))
+
+    async def store(self, key, text, value, scope):
+        self.entries[(scope, text)] = value
+
+@pytest.mark.asyncio
+async def test_analyze_semantic_cache_is_scoped_to_user_and_pursuit(mock_llm_service, fake_memory_service):
+    agent = GapAnalysisAgent(mock_llm_service, semantic_cache=ExactMatchCache(), memory_service=fake_memory_service)
+    mock_llm_service.generate_json.return_value = ACME_RESULT
+    pursuit = {"id": "p1", "entity_name": "Acme Corp"}
+    template_details = {"title": "Standard Proposal"}
+
+    await agent.analyze(pursuit, template_details, "user1")
+    await agent.analyze(pursuit, template_details, "user1")
+    assert mock_llm_service.generate_json.call_count == 1
+
+    # Same prompt, different user: must not be served user1's result
+    await agent.analyze(pursuit, template_details, "user2")
+    assert mock_llm_service.generate_json.call_count == 2
+
+    # Same user and prompt, different pursuit
+    await agent.analyze({"id": "p2", "entity_name": "Acme Corp"}, template_details, "user1")
+    assert mock_llm_service.generate_json.call_count == 3
+
+@pytest.mark.asyncio
+async def test_analyze_many_shares_memory_searches(agent, mock_llm_service, fake_memory_service):
+    mock_llm_service.generate_json.return_value = STARTUP_RESULT
+    pursuits = [
+        {"entity_name": "Acme Corp", "industry": "Technology"},
+        {"entity_name": "Acme Corp", "industry": "Technology"},
+        {"entity_name": "Startup Inc", "industry": "Retail"},
+    ]
+
+    results = await agent.analyze_many(pursuits, {"title": "Standard Proposal"}, "user1")
+
+    assert [r["gaps"] for r in results] == [["Gap 1"]] * 3
+    assert len(fake_memory_service.searches) == 2
+    assert mock_llm_service.generate_json.call_count == 3
+    assert agent._inflight == {}
+
+@pytest.mark.asyncio
+async def test_shared_memory_search_survives_cancelled_caller(agent, fake_memory_service):
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking_search(query, user_id, limit=5):
+        started.set()
+        release.wait(5)
+        return [{"memory": "Past analysis"}]
+
+    fake_memory_service.search_long_term = blocking_search
+    first = asyncio.create_task(agent._search_memory("query", "user1"))
+    second = asyncio.create_task(agent._search_memory("query", "user1"))
+    await asyncio.to_thread(started.wait, 5)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await second == [{"memory": "Past analysis"}]
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
 @pytest.mark.asyncio
 async def test_analyze_llm_failure(agent, mock_llm_service):
     # Setup inputs
@@ -0,0 +1,140 @@
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+from app.services.ai_service.llm_service import LLMService
+from app.services.ai_service.gap_analysis_agent import GapAnalysisResult
+from app.services.ai_service import response_cache
+from app.services.ai_service.response_cache import PersistentResponseCache
+
+TOOL_INPUT = {
+    "gaps": ["Pricing Model"],
+    "search_queries": ["Acme Corp pricing model"],
+    "reasoning": "Missing pricing info."
+}
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+@pytest.fixture
+def llm_service(tmp_path):
+    with patch("app.services.ai_service.llm_service.AsyncAnthropic") as MockAnthropic:
+        client = MockAnthropic.return_value
+        client.messages.create = AsyncMock(return_value=SimpleNamespace(content=[
+            SimpleNamespace(type="tool_use", name="GapAnalysisResult", input=TOOL_INPUT)
+        ]))
+        service = LLMService()
+        service.redis_client = FakeRedis()
+        service.response_store = PersistentResponseCache(str(tmp_path / "llm_cache.sqlite3"), ttl_seconds=3600)
+        yield service
+
+@pytest.mark.asyncio
+async def test_generate_json_cache_hit_skips_llm(llm_service):
+    first = await llm_service.generate_json(prompt="Analyze Acme", schema=GapAnalysisResult)
+    second = await llm_service.generate_json(prompt="Analyze Acme", schema=GapAnalysisResult)
+
+    assert first == second
+    assert second.gaps == ["Pricing Model"]
+    llm_service.client.messages.create.assert_called_once()
+    assert (llm_service.cache_misses, llm_service.cache_hits) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_generate_json_cache_key_includes_prompt_and_prefix(llm_service):
+    await llm_service.generate_json(prompt="Analyze Acme", schema=GapAnalysisResult)
+    await llm_service.generate_json(prompt="Analyze Startup", schema=GapAnalysisResult)
+    await llm_service.generate_json(prompt="Analyze Acme", schema=GapAnalysisResult, cached_prefix="Template A")
+
+    assert llm_service.client.messages.create.call_count == 3
+    assert llm_service.cache_hits == 0
+
+@pytest.mark.asyncio
+async def test_generate_json_cache_failure_falls_back_to_llm(llm_service):
+    llm_service.redis_client = Mock()
+    llm_service.redis_client.get = AsyncMock(side_effect=ConnectionError("redis down"))
+    llm_service.redis_client.setex = AsyncMock(side_effect=ConnectionError("redis down"))
+
+    result = await llm_service.generate_json(prompt="Analyze Acme", schema=GapAnalysisResult)
+
+    assert result.gaps == ["Pricing Model"]
+    llm_service.client.messages.create.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_generate_json_persistent_cache_survives_redis_flush(llm_service):
+    await llm_service.generate_json(prompt="Analyze Acme", schema=GapAnalysisResult)
+    llm_service.redis_client = FakeRedis()  # simulate a Redis restart
+
+    result = await llm_service.generate_json(prompt="Analyze Acme", schema=GapAnalysisResult)
+
+    assert result.gaps == ["Pricing Model"]
+    llm_service.client.messages.create.assert_called_once()
+    assert len(llm_service.redis_client.store) == 1  # refilled from the persistent store
+    assert llm_service.cache_hits == 1
+
+@pytest.mark.asyncio
+async def test_persistent_cache_ignores_expired_entries(tmp_path, monkeypatch):
+    store = PersistentResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=3600)
+    await store.set("key", "value")
+    assert await store.get("key") == "value"
+
+    now = time.time()
+    monkeypatch.setattr(response_cache.time, "time", lambda: now + 7200)
+    assert await store.get("key") is None
+
+@pytest.mark.asyncio
+async def test_persistent_cache_creates_missing_directory(tmp_path):
+    store = PersistentResponseCache(str(tmp_path / "missing" / "llm_cache.sqlite3"), ttl_seconds=3600)
+    await store.set("key", "value")
+
+    assert await store.get("key") == "value"
+    assert (tmp_path / "missing" / "llm_cache.sqlite3").exists()
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    @property
+    async def text_stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+@pytest.mark.asyncio
+async def test_generate_text_stream_yields_chunks(llm_service):
+    llm_service.client.messages.stream = Mock(return_value=FakeStream(["Hello", ", ", "world"]))
+
+    chunks = [c async for c in llm_service.generate_text_stream(prompt="Say hello")]
+
+    assert chunks == ["Hello", ", ", "world"]
+    assert llm_service.client.messages.stream.call_args.kwargs["messages"][0]["content"] == "Say hello"
+
+def test_llm_services_share_http_client():
+    with patch("app.services.ai_service.llm_service.AsyncAnthropic") as MockAnthropic:
+        LLMService()
+        LLMService()
+
+    first, second = (c.kwargs["http_client"] for c in MockAnthropic.call_args_list)
+    assert first is second
+
+def test_llm_services_share_response_store():
+    with patch("app.services.ai_service.llm_service.AsyncAnthropic"):
+        first, second = LLMService(), LLMService()
+
+    assert first.response_store is second.response_store
+
+def test_llm_services_share_redis_client():
+    with patch("app.services.ai_service.llm_service.AsyncAnthropic"):
+        first, second = LLMService(), LLMService()
+
+    assert first.redis_client is second.redis_client
@@ -1,33 +1,42 @@
 import pytest
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, Mock, patch
 import json
 
 # Assuming the agent will be implemented here
 # from app.services.ai_service.metadata_agent import MetadataExtractionAgent
 # from app.schemas.pursuit import PursuitMetadata
 
-from app.services.ai_service.metadata_agent import MetadataExtractionAgent
+from app.services.ai_service.metadata_agent import MetadataExtractionAgent, EXTRACTION_INSTRUCTIONS
+from app.services.ai_service.llm_service import LLMService
+
+# Sample RFP texts, built once at import
+FULL_RFP_TEXT = """
+    REQUEST FOR PROPOSAL
+    ...
+    """
+PARTIAL_RFP_TEXT = """
+    RFP for Software Development
+    
+    We need a React application built.
+    Please reply by next Friday.
+    """
 
 @pytest.fixture
 def mock_llm_service():
-    service = AsyncMock()
+    service = Mock(spec=LLMService)
+    service.generate_json = AsyncMock()
+    service.generate_text = AsyncMock()
     return service
 
 @pytest.fixture
-def metadata_agent(mock_llm_service):
-    return MetadataExtractionAgent(llm_service=mock_llm_service)
+def metadata_agent(mock_llm_service, fake_memory_service):
+    return MetadataExtractionAgent(llm_service=mock_llm_service, memory_service=fake_memory_service)
 
 @pytest.mark.asyncio
 async def test_extract_metadata_success(metadata_agent, mock_llm_service):
     """
     Test that the agent correctly extracts all available metadata from a clear RFP text.
     """
-    # Sample RFP text
-    rfp_text = """
-    REQUEST FOR PROPOSAL
-    ...
-    """
-    
     # Expected JSON response from the LLM (mocked)
     expected_llm_response = {
         "entity_name": "Acme Healthcare Corp",
@@ -47,7 +56,7 @@ async def test_extract_metadata_success(metadata_agent, mock_llm_service):
     mock_llm_service.generate_json.return_value = expected_llm_response
     
     # Act
-    result = await metadata_agent.extract(rfp_text)
+    result = await metadata_agent.extract(FULL_RFP_TEXT)
     
     # Assert
     assert result["entity_name"] == "Acme Healthcare Corp"
@@ -62,18 +71,30 @@ async def test_extract_metadata_success(metadata_agent, mock_llm_service):
     # Verify LLM was called
     mock_llm_service.generate_json.assert_called_once()
 
+@pytest.mark.asyncio
+async def test_extract_sends_instructions_and_rfp_as_cached_prefix(metadata_agent, mock_llm_service, fake_memory_service):
+    mock_llm_service.generate_json.return_value = {"entity_name": "Acme Healthcare Corp"}
+
+    await metadata_agent.extract(FULL_RFP_TEXT)
+    fake_memory_service.search_results = [{"memory": "Due date was extended to Feb 28."}]
+    await metadata_agent.extract(FULL_RFP_TEXT)
+    await metadata_agent.extract(PARTIAL_RFP_TEXT)
+
+    first, second, third = mock_llm_service.generate_json.call_args_list
+    # Re-extracting the same RFP reuses the prefix; only the memory context changes
+    assert first.kwargs["cached_prefix"] == second.kwargs["cached_prefix"]
+    assert first.kwargs["cached_prefix"].startswith(EXTRACTION_INSTRUCTIONS)
+    assert FULL_RFP_TEXT in first.kwargs["cached_prefix"]
+    assert FULL_RFP_TEXT not in second.kwargs["prompt"]
+    assert "extended to Feb 28" not in first.kwargs["prompt"]
+    assert "extended to Feb 28" in second.kwargs["prompt"]
+    assert PARTIAL_RFP_TEXT in third.kwargs["cached_prefix"]
+
 @pytest.mark.asyncio
 async def test_extract_metadata_partial(metadata_agent, mock_llm_service):
     """
     Test extraction when some fields are missing from the text.
     """
-    rfp_text = """
-    RFP for Software Development
-    
-    We need a React application built.
-    Please reply by next Friday.
-    """
-    
     expected_response = {
         "entity_name": None, # Missing
         "technologies": ["React"],
@@ -83,7 +104,7 @@ async def test_extract_metadata_partial(metadata_agent, mock_llm_service):
     
     mock_llm_service.generate_json.return_value = expected_response
     
-    result = await metadata_agent.extract(rfp_text)
+    result = await metadata_agent.extract(PARTIAL_RFP_TEXT)
     
     assert result["entity_name"] is None
     assert "React" in result["technologies"]
@@ -0,0 +1,43 @@
+import pytest
+from unittest.mock import Mock
+from app.services.semantic_cache import SemanticCache
+
+def query_result(distance, value="cached"):
+    return {"ids": [["key1"]], "distances": [[distance]], "metadatas": [[{"scope": "s", "value": value}]]}
+
+@pytest.fixture
+def collection():
+    return Mock()
+
+@pytest.fixture
+def cache(collection):
+    return SemanticCache("test_cache", threshold=0.92, collection=collection)
+
+@pytest.mark.asyncio
+async def test_lookup_hit_above_threshold(cache, collection):
+    collection.query.return_value = query_result(0.05)
+
+    assert await cache.lookup("prompt", scope="s") == "cached"
+    assert collection.query.call_args.kwargs["where"] == {"scope": "s"}
+
+@pytest.mark.asyncio
+async def test_lookup_miss_below_threshold(cache, collection):
+    collection.query.return_value = query_result(0.2)
+
+    assert await cache.lookup("prompt", scope="s") is None
+
+@pytest.mark.asyncio
+async def test_lookup_empty_and_failure(cache, collection):
+    collection.query.return_value = {"ids": [[]], "distances": [[]], "metadatas": [[]]}
+    assert await cache.lookup("prompt", scope="s") is None
+
+    collection.query.side_effect = Exception("chroma down")
+    assert await cache.lookup("prompt", scope="s") is None
+
+@pytest.mark.asyncio
+async def test_store_upserts_value_with_scope(cache, collection):
+    await cache.store("key1", "prompt", "value", scope="s")
+
+    collection.upsert.assert_called_once_with(
+        ids=["key1"], documents=["prompt"], metadatas=[{"scope": "s", "value": "value"}]
+    )
@@ -0,0 +1,10 @@
+import functools
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+@functools.lru_cache(maxsize=None)
+def get_rfp(name: str) -> str:
+    """Sample RFP text shared by the extraction scripts, read from fixtures/<name>_rfp.txt once per process."""
+    with open(os.path.join(FIXTURES_DIR, f"{name}_rfp.txt"), "r", encoding="utf-8") as f:
+        return f.read()
@@ -1,11 +1,36 @@
 import os
 import shutil
-import glob
+import hashlib
+import json
 import argparse
 from datetime import datetime
 
 # Default configuration (can be overridden by args)
 DEFAULT_DEST_DIR = "antigravity_walkthrough"
+# Records the content hash of the last archived copy of each walkthrough
+MANIFEST_NAME = ".manifest.json"
+
+def file_digest(path):
+    hasher = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(64 * 1024), b""):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+def load_manifest(dest_dir):
+    try:
+        with open(os.path.join(dest_dir, MANIFEST_NAME), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_manifest(dest_dir, manifest):
+    # Write to a temp file and rename so an interrupted run can't leave a truncated manifest
+    path = os.path.join(dest_dir, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
 
 def archive_walkthroughs(source_dir, dest_dir):
     # Create destination directory if it doesn't exist
@@ -14,18 +39,27 @@ def archive_walkthroughs(source_dir, dest_dir):
         print(f"Created directory: {dest_dir}")
 
     # Find all walkthrough markdown files
-    pattern = os.path.join(source_dir, "walkthrough*.md")
-    files = glob.glob(pattern)
+    with os.scandir(source_dir) as entries:
+        files = [
+            entry.path for entry in entries
+            if entry.name.startswith("walkthrough") and entry.name.endswith(".md") and entry.is_file()
+        ]
 
     if not files:
         print(f"No walkthrough files found in {source_dir} to archive.")
         return
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    manifest = load_manifest(dest_dir)
 
     for src_path in files:
         filename = os.path.basename(src_path)
         name, ext = os.path.splitext(filename)
+
+        digest = file_digest(src_path)
+        if manifest.get(filename) == digest:
+            print(f"Unchanged, skipping: {filename}")
+            continue
         
         # Create new filename with timestamp
         new_filename = f"{name}_{timestamp}{ext}"
@@ -33,10 +67,13 @@ def archive_walkthroughs(source_dir, dest_dir):
 
         try:
             shutil.copy2(src_path, dest_path)
+            manifest[filename] = digest
             print(f"Copied: {filename} -> {dest_path}")
         except Exception as e:
             print(f"Error copying {filename}: {e}")
 
+    save_manifest(dest_dir, manifest)
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Archive walkthrough artifacts.")
     parser.add_argument("--source", required=True, help="Source directory containing walkthrough files")
@@ -12,22 +12,28 @@ PURSUIT_ID = "0dfff069-2b1e-4b58-b3db-29ea740a400d"
 
 async def main():
     async with AsyncSessionLocal() as session:
-        result = await session.execute(
-            text("SELECT id, file_name, extracted_text, extraction_status FROM pursuit_files WHERE pursuit_id = :pursuit_id"),
+        # Truncate in SQL and stream rows so full extracted_text blobs never cross the wire
+        result = await session.stream(
+            text(
+                "SELECT id, file_name, substring(extracted_text, 1, 500) AS preview, "
+                "length(extracted_text) AS text_len, extraction_status "
+                "FROM pursuit_files WHERE pursuit_id = :pursuit_id"
+            ),
             {"pursuit_id": PURSUIT_ID}
         )
-        files = result.fetchall()
         
-        print(f"Found {len(files)} files for pursuit {PURSUIT_ID}")
-        for file in files:
+        count = 0
+        async for file in result:
+            count += 1
             print(f"\nFile: {file.file_name} (ID: {file.id})")
             print(f"Status: {file.extraction_status}")
-            content = file.extracted_text
-            if content:
-                print(f"Extracted Text Length: {len(content)}")
-                print(f"Preview (first 500 chars):\n{content[:500]}")
+            if file.text_len:
+                print(f"Extracted Text Length: {file.text_len}")
+                print(f"Preview (first 500 chars):\n{file.preview}")
             else:
                 print("Extracted Text: <EMPTY/NULL>")
 
+        print(f"\nFound {count} files for pursuit {PURSUIT_ID}")
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,9 +1,9 @@
-import chromadb
-from mem0 import Memory
 import os
 import sys
 
 def test_chroma_direct():
+    import chromadb
+
     print("Testing direct ChromaDB connection...")
     try:
         client = chromadb.HttpClient(host="chroma", port=8000)
@@ -14,6 +14,8 @@ def test_chroma_direct():
         print(f"Direct connection failed: {e}")
 
 def test_mem0():
+    from mem0 import Memory
+
     print("\nTesting mem0 connection...")
     config = {
         "vector_store": {
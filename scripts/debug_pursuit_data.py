@@ -1,33 +1,101 @@
-import requests
-import json
+import asyncio
+import os
+import time
+import httpx
+import orjson
+from jose import jwt
 
 # Configuration
 API_URL = "http://localhost:8000/api/v1"
 EMAIL = "test@example.com"
 PASSWORD = "password123"
 PURSUIT_ID = "0dfff069-2b1e-4b58-b3db-29ea740a400d"
+# Access tokens are reused across runs until shortly before they expire
+TOKEN_CACHE_PATH = os.path.expanduser("~/.cache/pursuit_token.json")
+TOKEN_EXPIRY_MARGIN_SECONDS = 60
 
-def get_access_token():
-    response = requests.post(
+async def get_access_token(client: httpx.AsyncClient):
+    response = await client.post(
         f"{API_URL}/auth/login",
         data={"username": EMAIL, "password": PASSWORD}
     )
     if response.status_code != 200:
         print(f"Login failed: {response.text}")
         return None
-    return response.json()["access_token"]
+    return orjson.loads(response.content)["access_token"]
 
-def get_pursuit_details(token):
+def _load_tokens():
+    try:
+        with open(TOKEN_CACHE_PATH, "rb") as f:
+            tokens = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    return tokens if isinstance(tokens, dict) else {}
+
+def _write_tokens(tokens):
+    os.makedirs(os.path.dirname(TOKEN_CACHE_PATH), exist_ok=True)
+    with open(os.open(TOKEN_CACHE_PATH, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as f:
+        f.write(orjson.dumps(tokens))
+
+def _load_cached_token():
+    cached = _load_tokens().get(f"{API_URL}|{EMAIL}")
+    # A malformed entry is treated as missing, so the caller logs in afresh
+    if not isinstance(cached, dict):
+        return None
+    token, exp = cached.get("token"), cached.get("exp")
+    if not isinstance(token, str) or not isinstance(exp, (int, float)):
+        return None
+    if exp - time.time() > TOKEN_EXPIRY_MARGIN_SECONDS:
+        return token
+    return None
+
+def _store_token(token):
+    tokens = _load_tokens()
+    tokens[f"{API_URL}|{EMAIL}"] = {"token": token, "exp": jwt.get_unverified_claims(token)["exp"]}
+    _write_tokens(tokens)
+
+def _evict_token():
+    tokens = _load_tokens()
+    if tokens.pop(f"{API_URL}|{EMAIL}", None) is not None:
+        _write_tokens(tokens)
+
+async def get_token_cached(client: httpx.AsyncClient):
+    """Return a still-valid token from the last run, logging in only when there is none."""
+    token = _load_cached_token()
+    if token:
+        return token
+    token = await get_access_token(client)
+    if token:
+        _store_token(token)
+    return token
+
+async def _get_pursuit(client: httpx.AsyncClient, token):
     headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{API_URL}/pursuits/{PURSUIT_ID}", headers=headers)
+    return await client.get(f"{API_URL}/pursuits/{PURSUIT_ID}", headers=headers)
+
+async def get_pursuit_details(client: httpx.AsyncClient, token):
+    response = await _get_pursuit(client, token)
+    if response.status_code == 401:
+        # The server no longer accepts the cached token (rotated secret, re-seeded DB),
+        # so drop it and log in once more
+        _evict_token()
+        token = await get_token_cached(client)
+        if not token:
+            return None
+        response = await _get_pursuit(client, token)
     if response.status_code != 200:
         print(f"Failed to get pursuit: {response.text}")
         return None
-    return response.json()
+    return orjson.loads(response.content)
+
+async def main():
+    # One client for both calls so the pursuit fetch reuses the login's connection
+    async with httpx.AsyncClient() as client:
+        token = await get_token_cached(client)
+        if token:
+            pursuit = await get_pursuit_details(client, token)
+            if pursuit:
+                print(orjson.dumps(pursuit, option=orjson.OPT_INDENT_2).decode())
 
 if __name__ == "__main__":
-    token = get_access_token()
-    if token:
-        pursuit = get_pursuit_details(token)
-        if pursuit:
-            print(json.dumps(pursuit, indent=2))
+    asyncio.run(main())
@@ -49,19 +49,22 @@ def get_containers() -> List[Dict]:
         return []
     
     try:
-        # docker compose ps --format json returns a stream of JSON objects (one per line) or a list
-        output = result.stdout.strip()
-        if not output:
-            return []
-        
+        # docker compose ps --format json returns a stream of JSON objects (one per line)
+        # or a single list, depending on the compose version; decode either in one pass.
+        output = result.stdout
+        decoder = json.JSONDecoder()
         containers = []
-        # Handle potential multiple JSON objects or list
-        if output.startswith("["):
-             containers = json.loads(output)
-        else:
-            for line in output.splitlines():
-                if line:
-                    containers.append(json.loads(line))
+        pos = 0
+        while True:
+            while pos < len(output) and output[pos].isspace():
+                pos += 1
+            if pos >= len(output):
+                break
+            obj, pos = decoder.raw_decode(output, pos)
+            if isinstance(obj, list):
+                containers.extend(obj)
+            else:
+                containers.append(obj)
         return containers
     except json.JSONDecodeError:
         print_error("Failed to parse Docker output.")
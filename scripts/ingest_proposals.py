@@ -1,14 +1,21 @@
 import os
+import asyncio
 import glob
 import logging
 import argparse
-from typing import List, Dict
-import chromadb
-from chromadb.utils import embedding_functions
-from docx import Document
-from pptx import Presentation
+import functools
+import hashlib
+import json
+import tempfile
+import time
+from typing import TYPE_CHECKING, List, Dict
 from dotenv import load_dotenv
 
+# chromadb, openai, tiktoken and the docx/pptx parsers are imported where they are
+# used, so `--help` and argument errors don't pay for loading them.
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI, OpenAI
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,8 +26,25 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
+# Max collection.add batches embedded/indexed at the same time
+INGEST_CONCURRENCY = 5
+# Chunks per collection.add call
+ADD_BATCH_SIZE = 512
+# Chunks per embeddings request, and how many requests run at once
+EMBED_BATCH_SIZE = 100
+EMBED_CONCURRENCY = 10
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+# OpenAI Batch API limits a single batch to 50,000 requests
+BATCH_API_MAX_REQUESTS = 50000
+BATCH_API_POLL_SECONDS = 30
+
+# Extracted text of already-seen files, keyed by a hash of their bytes
+EXTRACT_CACHE_DIR = "./.extract_cache"
+
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text from a .docx file."""
+    from docx import Document
     try:
         doc = Document(file_path)
         return "\n".join([para.text for para in doc.paragraphs if para.text.strip()])
@@ -30,6 +54,7 @@ def extract_text_from_docx(file_path: str) -> str:
 
 def extract_text_from_pptx(file_path: str) -> str:
     """Extract text from a .pptx file."""
+    from pptx import Presentation
     try:
         prs = Presentation(file_path)
         text_runs = []
@@ -44,51 +69,274 @@ def extract_text_from_pptx(file_path: str) -> str:
         logger.exception(f"Error reading {file_path}")
         return ""
 
-def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 100) -> List[str]:
+def _cached_extract(file_path: str, extractor) -> str:
     """
-    Split text into chunks with overlap, respecting sentence boundaries where possible.
-    This is a simple improvement over character slicing.
+    Run extractor on file_path, reusing the text from a previous run if the file's
+    bytes are unchanged. Failed (empty) extractions are not cached.
+    """
+    hasher = hashlib.blake2b(extractor.__name__.encode("utf-8"), digest_size=16)
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(block)
+    cache_path = os.path.join(EXTRACT_CACHE_DIR, f"{hasher.hexdigest()}.txt")
+
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    text = extractor(file_path)
+    if text:
+        os.makedirs(EXTRACT_CACHE_DIR, exist_ok=True)
+        # Write to a temp file and rename it into place, so an interrupted run never
+        # leaves a truncated entry behind to be served on later runs
+        fd, tmp_path = tempfile.mkstemp(dir=EXTRACT_CACHE_DIR, suffix=".tmp")
+        try:
+            with open(fd, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    return text
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    """Tokenizer used by the embedding model, loaded once per process."""
+    import tiktoken
+    return tiktoken.encoding_for_model(EMBEDDING_MODEL)
+
+def chunk_text(text: str, chunk_size: int = 400, overlap: int = 40) -> List[str]:
+    """
+    Split text into windows of chunk_size tokens, each overlapping the previous one by
+    overlap tokens. Counting in the embedding model's own tokens keeps every chunk
+    well inside its input limit.
     """
     if not text:
         return []
-    
-    # Simple recursive splitting by paragraphs first, then characters if needed
-    # For now, let's improve the sliding window to not cut words in half if possible
-    # A more robust solution would use langchain's RecursiveCharacterTextSplitter
-    
+
+    encoding = _encoding()
+    tokens = encoding.encode(text, disallowed_special=())
+    step = chunk_size - overlap
+
     chunks = []
-    start = 0
-    text_len = len(text)
-    
-    while start < text_len:
-        end = start + chunk_size
-        
-        # If we are not at the end of text, try to find the last space within the chunk
-        if end < text_len:
-            # Look for the last space in the chunk to avoid splitting words
-            last_space = text.rfind(' ', start, end)
-            if last_space != -1:
-                end = last_space
-        
-        chunk = text[start:end].strip()
+    for start in range(0, len(tokens), step):
+        chunk = encoding.decode(tokens[start:start + chunk_size]).strip()
         if chunk:
             chunks.append(chunk)
-        
-        # Move start forward, subtracting overlap
-        start = end - overlap
-        
-        # Ensure we always move forward to avoid infinite loops
-        if start >= end:
-            start = end
-            
+        if start + chunk_size >= len(tokens):
+            break
+
     return chunks
 
-def main():
+async def load_chunks(file_path: str) -> List[str]:
+    """Extract and chunk a single file in worker threads. Returns [] if there is nothing to index."""
+    filename = os.path.basename(file_path)
+    logger.info(f"Processing {filename}...")
+
+    if filename.endswith(".docx"):
+        text = await asyncio.to_thread(_cached_extract, file_path, extract_text_from_docx)
+    elif filename.endswith(".pptx"):
+        text = await asyncio.to_thread(_cached_extract, file_path, extract_text_from_pptx)
+    else:
+        logger.warning(f"Skipping unsupported file type: {filename}")
+        return []
+
+    if not text:
+        logger.warning(f"No text extracted from {filename}")
+        return []
+
+    chunks = await asyncio.to_thread(chunk_text, text)
+    logger.info(f"  - {filename}: generated {len(chunks)} chunks")
+    return chunks
+
+def content_id(chunk: str) -> str:
+    """Content-addressed ChromaDB id, so unchanged or duplicate chunks map to the same record."""
+    return hashlib.blake2b(chunk.encode("utf-8"), digest_size=16).hexdigest()
+
+def chunk_records(filename: str, chunks: List[str]):
+    """ChromaDB ids and metadatas for a file's chunks."""
+    ids = [content_id(chunk) for chunk in chunks]
+    metadatas = [{"source": filename, "chunk_index": i} for i in range(len(chunks))]
+    return ids, metadatas
+
+async def collect_chunks(files: List[str]):
+    """Chunk every file concurrently; returns flat ids, documents and metadatas across all files."""
+    per_file = await asyncio.gather(*(load_chunks(file_path) for file_path in files))
+
+    all_ids, all_documents, all_metadatas = [], [], []
+    seen = set()
+    for file_path, chunks in zip(files, per_file):
+        ids, metadatas = chunk_records(os.path.basename(file_path), chunks)
+        for chunk_id, chunk, metadata in zip(ids, chunks, metadatas):
+            # Identical chunks (repeated boilerplate across proposals) are stored once
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
+            all_ids.append(chunk_id)
+            all_documents.append(chunk)
+            all_metadatas.append(metadata)
+    return all_ids, all_documents, all_metadatas
+
+async def existing_ids(collection, ids: List[str]) -> set:
+    """Ids that are already stored in the collection, looked up in ADD_BATCH_SIZE slices."""
+    lookups = await asyncio.gather(*(
+        asyncio.to_thread(collection.get, ids=ids[offset:offset + ADD_BATCH_SIZE], include=[])
+        for offset in range(0, len(ids), ADD_BATCH_SIZE)
+    ))
+    return {chunk_id for result in lookups for chunk_id in result["ids"]}
+
+async def add_in_batches(collection, ids: List[str], documents: List[str], metadatas: List[Dict], embeddings=None) -> int:
+    """
+    Add records to the collection in uniform batches of ADD_BATCH_SIZE, up to
+    INGEST_CONCURRENCY at a time. Returns the number of chunks indexed.
+    """
+    sem = asyncio.Semaphore(INGEST_CONCURRENCY)
+
+    async def add_batch(offset: int) -> int:
+        end = offset + ADD_BATCH_SIZE
+        batch = {
+            "ids": ids[offset:end],
+            "documents": documents[offset:end],
+            "metadatas": metadatas[offset:end],
+        }
+        if embeddings is not None:
+            batch["embeddings"] = embeddings[offset:end]
+        try:
+            async with sem:
+                await asyncio.to_thread(collection.add, **batch)
+            logger.info(f"  - Indexed chunks {offset}-{offset + len(batch['ids']) - 1}")
+            return len(batch["ids"])
+        except Exception:
+            logger.exception(f"  - Error indexing chunks {offset}-{end - 1}")
+            return 0
+
+    counts = await asyncio.gather(*(add_batch(offset) for offset in range(0, len(ids), ADD_BATCH_SIZE)))
+    return sum(counts)
+
+async def embed_concurrently(openai_client: "AsyncOpenAI", ids: List[str], documents: List[str]) -> Dict[str, List[float]]:
+    """
+    Embed documents with concurrent requests of EMBED_BATCH_SIZE inputs each, at most
+    EMBED_CONCURRENCY in flight. Returns a mapping of id -> embedding; batches that fail
+    are logged and left out.
+    """
+    sem = asyncio.Semaphore(EMBED_CONCURRENCY)
+
+    async def embed_batch(offset: int) -> Dict[str, List[float]]:
+        batch_ids = ids[offset:offset + EMBED_BATCH_SIZE]
+        try:
+            async with sem:
+                response = await openai_client.embeddings.create(
+                    model=EMBEDDING_MODEL,
+                    input=documents[offset:offset + EMBED_BATCH_SIZE]
+                )
+        except Exception:
+            logger.exception(f"  - Error embedding chunks {offset}-{offset + len(batch_ids) - 1}")
+            return {}
+        return {chunk_id: item.embedding for chunk_id, item in zip(batch_ids, response.data)}
+
+    results = await asyncio.gather(*(embed_batch(offset) for offset in range(0, len(ids), EMBED_BATCH_SIZE)))
+    embeddings = {}
+    for result in results:
+        embeddings.update(result)
+    return embeddings
+
+def embed_with_batch_api(openai_client: "OpenAI", ids: List[str], documents: List[str]) -> Dict[str, List[float]]:
+    """
+    Embed documents through the OpenAI Batch API (half the price of synchronous calls,
+    completes asynchronously). Blocks until every batch has finished and returns a
+    mapping of id -> embedding.
+    """
+    embeddings = {}
+    for offset in range(0, len(ids), BATCH_API_MAX_REQUESTS):
+        batch_ids = ids[offset:offset + BATCH_API_MAX_REQUESTS]
+        batch_docs = documents[offset:offset + BATCH_API_MAX_REQUESTS]
+
+        lines = [
+            json.dumps({
+                "custom_id": chunk_id,
+                "method": "POST",
+                "url": "/v1/embeddings",
+                "body": {"model": EMBEDDING_MODEL, "input": doc}
+            })
+            for chunk_id, doc in zip(batch_ids, batch_docs)
+        ]
+        input_file = openai_client.files.create(
+            file=("embeddings.jsonl", "\n".join(lines).encode("utf-8")),
+            purpose="batch"
+        )
+        batch = openai_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/embeddings",
+            completion_window="24h"
+        )
+        logger.info(f"Submitted embedding batch {batch.id} ({len(batch_ids)} chunks)")
+
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            time.sleep(BATCH_API_POLL_SECONDS)
+            batch = openai_client.batches.retrieve(batch.id)
+            logger.info(f"  - Batch {batch.id}: {batch.status}")
+
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(f"Embedding batch {batch.id} ended with status {batch.status}")
+            continue
+
+        output = openai_client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") != 200:
+                logger.warning(f"  - No embedding for {record.get('custom_id')}: {record.get('error')}")
+                continue
+            embeddings[record["custom_id"]] = response["body"]["data"][0]["embedding"]
+
+    return embeddings
+
+async def ingest(collection, files: List[str], openai_api_key: str, use_batch_api: bool = False) -> int:
+    """
+    Chunk every file, embed all chunks ourselves (concurrent requests, or one Batch API
+    job), then write documents to the collection with their precomputed embeddings.
+    """
+    all_ids, all_documents, all_metadatas = await collect_chunks(files)
+
+    # Chunks already in the collection were embedded on an earlier run; only embed new ones
+    present = await existing_ids(collection, all_ids)
+    if present:
+        logger.info(f"Skipping {len(present)} chunks already in the collection")
+        new = [i for i, chunk_id in enumerate(all_ids) if chunk_id not in present]
+        all_ids = [all_ids[i] for i in new]
+        all_documents = [all_documents[i] for i in new]
+        all_metadatas = [all_metadatas[i] for i in new]
+
+    if not all_ids:
+        return 0
+
+    from openai import AsyncOpenAI, OpenAI
+
+    if use_batch_api:
+        openai_client = OpenAI(api_key=openai_api_key)
+        embeddings = await asyncio.to_thread(embed_with_batch_api, openai_client, all_ids, all_documents)
+    else:
+        async with AsyncOpenAI(api_key=openai_api_key) as openai_client:
+            embeddings = await embed_concurrently(openai_client, all_ids, all_documents)
+
+    keep = [i for i, chunk_id in enumerate(all_ids) if chunk_id in embeddings]
+    return await add_in_batches(
+        collection,
+        ids=[all_ids[i] for i in keep],
+        documents=[all_documents[i] for i in keep],
+        metadatas=[all_metadatas[i] for i in keep],
+        embeddings=[embeddings[all_ids[i]] for i in keep]
+    )
+
+async def main():
     parser = argparse.ArgumentParser(description="Ingest proposals into ChromaDB")
     parser.add_argument("--data-dir", default=os.path.join(os.path.dirname(__file__), "../Data/PriorProposal"), help="Directory containing proposal files")
     parser.add_argument("--chroma-host", default="localhost", help="ChromaDB host")
     parser.add_argument("--chroma-port", type=int, default=8001, help="ChromaDB port")
     parser.add_argument("--collection-name", default="prior_proposals", help="ChromaDB collection name")
+    parser.add_argument("--batch-api", action="store_true", help="Embed through the OpenAI Batch API (cheaper, but may take hours)")
     args = parser.parse_args()
 
     openai_api_key = os.getenv("OPENAI_API_KEY")
@@ -96,6 +344,9 @@ def main():
         logger.error("OPENAI_API_KEY not found in environment variables")
         return
 
+    import chromadb
+    from chromadb.utils import embedding_functions
+
     logger.info(f"Connecting to ChromaDB at {args.chroma_host}:{args.chroma_port}...")
     try:
         client = chromadb.HttpClient(host=args.chroma_host, port=args.chroma_port)
@@ -108,7 +359,7 @@ def main():
     # Initialize OpenAI embedding function
     openai_ef = embedding_functions.OpenAIEmbeddingFunction(
         api_key=openai_api_key,
-        model_name="text-embedding-3-small"
+        model_name=EMBEDDING_MODEL
     )
 
     # Get or create collection
@@ -130,47 +381,9 @@ def main():
     files = glob.glob(os.path.join(args.data_dir, "*"))
     logger.info(f"Found {len(files)} files in {args.data_dir}")
 
-    total_chunks = 0
-    
-    for file_path in files:
-        filename = os.path.basename(file_path)
-        logger.info(f"Processing {filename}...")
-        
-        if filename.endswith(".docx"):
-            text = extract_text_from_docx(file_path)
-        elif filename.endswith(".pptx"):
-            text = extract_text_from_pptx(file_path)
-        else:
-            logger.warning(f"Skipping unsupported file type: {filename}")
-            continue
-            
-        if not text:
-            logger.warning(f"No text extracted from {filename}")
-            continue
-            
-        chunks = chunk_text(text)
-        logger.info(f"  - Generated {len(chunks)} chunks")
-        
-        if not chunks:
-            continue
-
-        # Prepare data for ChromaDB
-        ids = [f"{filename}_chunk_{i}" for i in range(len(chunks))]
-        metadatas = [{"source": filename, "chunk_index": i} for i in range(len(chunks))]
-        
-        # Add to collection
-        try:
-            collection.add(
-                documents=chunks,
-                metadatas=metadatas,
-                ids=ids
-            )
-            total_chunks += len(chunks)
-            logger.info(f"  - Indexed {len(chunks)} chunks")
-        except Exception as e:
-            logger.exception(f"  - Error indexing chunks for {filename}")
+    total_chunks = await ingest(collection, files, openai_api_key, use_batch_api=args.batch_api)
 
     logger.info(f"Ingestion complete! Total chunks indexed: {total_chunks}")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,4 +1,7 @@
 import os
+import socket
+import sys
+from functools import lru_cache
 import chromadb
 from chromadb.utils import embedding_functions
 from dotenv import load_dotenv
@@ -11,46 +14,68 @@ CHROMA_HOST = "localhost"
 CHROMA_PORT = 8001
 COLLECTION_NAME = "prior_proposals"
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+DEFAULT_QUERIES = ["AI Governance Framework"]
 
 if not OPENAI_API_KEY:
     raise ValueError("OPENAI_API_KEY not found in environment variables")
 
-def main():
-    print(f"Connecting to ChromaDB at {CHROMA_HOST}:{CHROMA_PORT}...")
+def chroma_server_reachable(timeout=0.2):
+    """
+    Fast TCP probe for the Chroma server. Deciding the backend up front means a down
+    server can't surface later as a failed query against the wrong client.
+    """
     try:
-        client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
-    except Exception as e:
-        print(f"Failed to connect to ChromaDB HTTP client: {e}")
-        print("Falling back to local PersistentClient at ./chroma_db")
-        client = chromadb.PersistentClient(path="./chroma_db")
+        socket.create_connection((CHROMA_HOST, CHROMA_PORT), timeout=timeout).close()
+        return True
+    except OSError:
+        return False
+
+@lru_cache(maxsize=1)
+def get_client():
+    if chroma_server_reachable():
+        print(f"Connecting to ChromaDB at {CHROMA_HOST}:{CHROMA_PORT}...")
+        return chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+    print(f"ChromaDB not reachable at {CHROMA_HOST}:{CHROMA_PORT}; using local PersistentClient at ./chroma_db")
+    return chromadb.PersistentClient(path="./chroma_db")
 
+@lru_cache(maxsize=8)
+def get_collection(name):
+    """
+    Resolve a collection once per process; repeated lookups (e.g. when querying in a
+    loop) reuse the handle instead of making another get_collection round trip.
+    """
     openai_ef = embedding_functions.OpenAIEmbeddingFunction(
         api_key=OPENAI_API_KEY,
         model_name="text-embedding-3-small"
     )
+    return get_client().get_collection(
+        name=name,
+        embedding_function=openai_ef
+    )
 
+def main():
     try:
-        collection = client.get_collection(
-            name=COLLECTION_NAME,
-            embedding_function=openai_ef
-        )
+        collection = get_collection(COLLECTION_NAME)
     except Exception as e:
         print(f"Error getting collection: {e}")
         return
 
-    query_text = "AI Governance Framework"
-    print(f"\nQuerying for: '{query_text}'")
+    # Queries come from the command line; all of them are embedded in one request and
+    # searched in one collection.query call.
+    queries = sys.argv[1:] or DEFAULT_QUERIES
     
     results = collection.query(
-        query_texts=[query_text],
+        query_texts=queries,
         n_results=3
     )
 
-    for i, doc in enumerate(results['documents'][0]):
-        metadata = results['metadatas'][0][i]
-        print(f"\nResult {i+1}:")
-        print(f"Source: {metadata['source']}")
-        print(f"Content Snippet: {doc[:200]}...")
+    for q, query_text in enumerate(queries):
+        print(f"\nQuerying for: '{query_text}'")
+        for i, doc in enumerate(results['documents'][q]):
+            metadata = results['metadatas'][q][i]
+            print(f"\nResult {i+1}:")
+            print(f"Source: {metadata['source']}")
+            print(f"Content Snippet: {doc[:200]}...")
 
 if __name__ == "__main__":
     main()
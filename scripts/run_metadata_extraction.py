@@ -2,7 +2,10 @@ import asyncio
 import os
 import sys
 import logging
-from docx import Document
+import zipfile
+import xml.etree.ElementTree as ET
+
+import orjson
 
 # Configure logging
 logging.basicConfig(
@@ -16,15 +19,41 @@ backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'ba
 if backend_path not in sys.path:
     sys.path.append(backend_path)
 
-from app.services.ai_service.llm_service import LLMService
-from app.services.ai_service.metadata_agent import MetadataExtractionAgent
+from app.services.ai_service._singletons import get_metadata_agent
+
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+def iter_docx_paragraphs(file_path):
+    """
+    Stream paragraphs out of word/document.xml as they are parsed, without building
+    python-docx's object tree. Paragraphs inside tables are included.
+    """
+    parts = []
+    in_paragraph_props = 0
+    with zipfile.ZipFile(file_path) as z, z.open("word/document.xml") as f:
+        for event, el in ET.iterparse(f, events=("start", "end")):
+            tag = el.tag
+            if tag == f"{W_NS}pPr":
+                # Tab stop definitions live in paragraph properties; they aren't text
+                in_paragraph_props += 1 if event == "start" else -1
+            elif event == "start":
+                continue
+            elif tag == f"{W_NS}t":
+                parts.append(el.text or "")
+            elif tag == f"{W_NS}tab" and not in_paragraph_props:
+                parts.append("\t")
+            elif tag in (f"{W_NS}br", f"{W_NS}cr"):
+                parts.append("\n")
+            elif tag == f"{W_NS}p":
+                yield "".join(parts)
+                parts.clear()
+                el.clear()
 
 def read_docx(file_path):
-    doc = Document(file_path)
-    full_text = []
-    for para in doc.paragraphs:
-        full_text.append(para.text)
-    return '\n'.join(full_text)
+    """
+    Return the document text, one paragraph per line.
+    """
+    return "\n".join(iter_docx_paragraphs(file_path))
 
 async def main():
     # Check if running in container with mounted data
@@ -37,14 +66,18 @@ async def main():
         logger.error(f"File not found at {file_path}")
         return
 
+    # The agent needs the whole text in one request, so the paragraphs are joined once;
+    # parsing runs in a thread so it overlaps with setting up the LLM and memory services
     logger.info(f"Reading file: {file_path}")
-    rfp_text = read_docx(file_path)
-    logger.info(f"Extracted {len(rfp_text)} characters.")
+    # run_in_executor submits immediately, before the blocking setup below runs
+    read_future = asyncio.get_running_loop().run_in_executor(None, read_docx, file_path)
     
     logger.info("Initializing Agent...")
     try:
-        llm_service = LLMService()
-        agent = MetadataExtractionAgent(llm_service)
+        agent = get_metadata_agent()
+        
+        rfp_text = await read_future
+        logger.info(f"Extracted {len(rfp_text)} characters.")
         
         logger.info("Running Metadata Extraction (this may take a moment)...")
         result = await agent.extract(rfp_text)
@@ -52,10 +85,8 @@ async def main():
         logger.info("Extraction Results:")
         # If result is a Pydantic model, dump it to dict for pretty printing
         if hasattr(result, "model_dump"):
-            import json
-            print(json.dumps(result.model_dump(), indent=2, default=str))
-        else:
-            print(result)
+            result = result.model_dump()
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str).decode())
             
     except Exception as e:
         logger.exception("An error occurred during extraction")
@@ -10,25 +10,36 @@ from app.models.user import User
 from app.core.security import get_password_hash
 from sqlalchemy.future import select
 
+SEED_USERS = [
+    {"email": "test@example.com", "password": "password123", "full_name": "Test User"},
+]
+
 async def seed_db():
     async with AsyncSessionLocal() as session:
-        # Check if user exists
-        result = await session.execute(select(User).filter(User.email == "test@example.com"))
-        user = result.scalars().first()
+        # Check which users already exist
+        # Only the email column is selected, so no User rows are loaded or hydrated
+        result = await session.scalars(select(User.email).where(User.email.in_([u["email"] for u in SEED_USERS])))
+        existing = set(result)
+        users_spec = [u for u in SEED_USERS if u["email"] not in existing]
         
-        if not user:
-            print("Creating test user...")
-            user = User(
-                email="test@example.com",
-                hashed_password=get_password_hash("password123"),
-                full_name="Test User",
-                is_active=True
-            )
-            session.add(user)
+        if users_spec:
+            print(f"Creating {len(users_spec)} test user(s)...")
+            # Password hashing is deliberately CPU-heavy; hash in threads so the
+            # hashes are computed in parallel instead of blocking the event loop
+            hashes = await asyncio.gather(*(asyncio.to_thread(get_password_hash, u["password"]) for u in users_spec))
+            session.add_all([
+                User(
+                    email=u["email"],
+                    password_hash=h,
+                    full_name=u["full_name"],
+                    is_active=True
+                )
+                for u, h in zip(users_spec, hashes)
+            ])
             await session.commit()
-            print("Test user created.")
+            print("Test users created.")
         else:
-            print("Test user already exists.")
+            print("Test users already exist.")
 
 if __name__ == "__main__":
     # Ensure we use localhost for DB connection when running from host
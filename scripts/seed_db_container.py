@@ -9,35 +9,68 @@ from app.core.database import AsyncSessionLocal, engine, Base
 # Import models to register them with Base
 from app.models import User, Pursuit, PursuitFile, AuditLog
 from app.core.security import get_password_hash
+from sqlalchemy import inspect, text
 from sqlalchemy.future import select
 
+SEED_USERS = [
+    {"email": "test@example.com", "password": "password123", "full_name": "Test User"},
+]
+
+def _schema_matches(sync_conn) -> bool:
+    """
+    True if every model table exists with exactly the columns the models define.
+    """
+    inspector = inspect(sync_conn)
+    existing = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing:
+            return False
+        columns = {column["name"] for column in inspector.get_columns(table.name)}
+        if columns != {column.name for column in table.columns}:
+            return False
+    return True
+
 async def seed_db():
     print("Resetting database...")
+    # One transaction: truncate in place when the schema is already current, and only
+    # fall back to dropping and recreating tables on first run or after a model change
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.drop_all)
-        await conn.run_sync(Base.metadata.create_all)
-    print("Tables recreated.")
+        if await conn.run_sync(_schema_matches):
+            table_names = ", ".join(f'"{table.name}"' for table in Base.metadata.sorted_tables)
+            await conn.execute(text(f"TRUNCATE {table_names} RESTART IDENTITY CASCADE"))
+            print("Tables truncated.")
+        else:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+            print("Tables recreated.")
 
     print("Connecting to database...")
     try:
         async with AsyncSessionLocal() as session:
-            print("Checking for existing user...")
-            result = await session.execute(select(User).filter(User.email == "test@example.com"))
-            user = result.scalars().first()
+            print("Checking for existing users...")
+            # Only the email column is selected, so no User rows are loaded or hydrated
+            result = await session.scalars(select(User.email).where(User.email.in_([u["email"] for u in SEED_USERS])))
+            existing = set(result)
+            users_spec = [u for u in SEED_USERS if u["email"] not in existing]
             
-            if not user:
-                print("Creating test user...")
-                user = User(
-                    email="test@example.com",
-                    password_hash=get_password_hash("password123"),
-                    full_name="Test User",
-                    is_active=True
-                )
-                session.add(user)
+            if users_spec:
+                print(f"Creating {len(users_spec)} test user(s)...")
+                # Password hashing is deliberately CPU-heavy; hash in threads so the
+                # hashes are computed in parallel instead of blocking the event loop
+                hashes = await asyncio.gather(*(asyncio.to_thread(get_password_hash, u["password"]) for u in users_spec))
+                session.add_all([
+                    User(
+                        email=u["email"],
+                        password_hash=h,
+                        full_name=u["full_name"],
+                        is_active=True
+                    )
+                    for u, h in zip(users_spec, hashes)
+                ])
                 await session.commit()
-                print("Test user created.")
+                print("Test users created.")
             else:
-                print("Test user already exists.")
+                print("Test users already exist.")
     except Exception as e:
         print(f"Error seeding database: {e}")
         sys.exit(1)
@@ -2,7 +2,9 @@ import asyncio
 import os
 import sys
 import logging
+import logging.handlers
 import json
+import time
 from datetime import date
 from dotenv import load_dotenv
 
@@ -16,29 +18,51 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Simulation output is buffered and written out at each section banner, rather than
+# taking the stdout lock and flushing on every line
+report_handler = logging.handlers.MemoryHandler(capacity=1024, target=logging.StreamHandler(sys.stdout))
+report_handler.target.setFormatter(logging.Formatter("%(message)s"))
+report = logging.getLogger(f"{__name__}.report")
+report.setLevel(logging.INFO)
+report.addHandler(report_handler)
+report.propagate = False
+
+def banner(title, char="="):
+    report.info("\n" + char*50)
+    report.info(title)
+    report.info(char*50)
+    report_handler.flush()
+
 # Ensure backend is in path
 backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
 if backend_path not in sys.path:
     sys.path.append(backend_path)
 
-from app.services.ai_service.llm_service import LLMService
-from app.services.ai_service.metadata_agent import MetadataExtractionAgent
-from app.services.memory_service import MemoryService
+from app.services.ai_service._singletons import get_memory_service, get_metadata_agent
 
-# Fake RFP Text
-RFP_TEXT = """
-REQUEST FOR PROPOSAL
-Project: AI Transformation Initiative
-Client: Acme Corp
-Date: November 21, 2025
+from _rfp_fixtures import get_rfp
+
+# Upper bound and poll interval for waiting on a memory to become searchable
+INDEXING_TIMEOUT_SECONDS = 5
+INDEXING_POLL_SECONDS = 0.2
 
-Overview:
-Acme Corp is seeking a partner to develop a generative AI platform.
+# Fake RFP Text
+RFP_TEXT = get_rfp("acme_ai_transformation")
 
-Submission Details:
-Please submit your proposals by January 15, 2026.
-Contact: Jane Doe (jane.doe@acme.com)
-"""
+async def wait_indexed(memory_service, text_fragment, user_id, timeout=INDEXING_TIMEOUT_SECONDS, interval=INDEXING_POLL_SECONDS):
+    """
+    Poll long-term memory until a memory containing text_fragment is searchable, or the
+    timeout elapses. mem0 rewrites feedback into facts, so match on a short distinctive
+    fragment rather than the full text.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        hits = await asyncio.to_thread(memory_service.search_long_term, text_fragment, user_id, 5)
+        if any(text_fragment in hit.get("memory", "") for hit in hits or []):
+            return True
+        await asyncio.sleep(interval)
+    logger.warning(f"Memory containing '{text_fragment}' not searchable after {timeout}s")
+    return False
 
 async def main():
     from app.core.config import settings
@@ -48,81 +72,77 @@ async def main():
     logger.info(f"Using user_id: {user_id}")
     
     logger.info("Initializing services...")
-    llm_service = LLMService()
-    agent = MetadataExtractionAgent(llm_service)
-    memory_service = MemoryService()
+    memory_service = get_memory_service()
+    agent = get_metadata_agent()
     # or we could try to delete if we had the IDs. For now, we assume the prompt will prioritize recent/relevant info.
     
-    print("\n" + "="*50)
-    print("ROUND 1: Initial Extraction (No Feedback)")
-    print("="*50)
+    banner("ROUND 1: Initial Extraction (No Feedback)")
     
     result1 = await agent.extract(RFP_TEXT, user_id=user_id)
-    print(f"Extracted Due Date: {result1.get('submission_due_date')}")
-    print(f"Extracted Owner: {result1.get('client_pursuit_owner_name')}")
+    report.info(f"Extracted Due Date: {result1.get('submission_due_date')}")
+    report.info(f"Extracted Owner: {result1.get('client_pursuit_owner_name')}")
     
     # Test Simple Memory
+    # mem0 writes are blocking LLM + embedding round trips; run them in threads so this
+    # one overlaps with the feedback write below.
     logger.info("Testing simple memory addition...")
-    try:
-        res = memory_service.add_long_term("I like to play cricket on weekends", user_id=user_id)
-        logger.info(f"Simple memory add result: {res}")
-    except Exception as e:
-        logger.error(f"Simple memory add failed: {e}")
+    simple_memory_task = asyncio.create_task(
+        asyncio.to_thread(memory_service.add_long_term, "I like to play cricket on weekends", user_id=user_id)
+    )
     
     # Simulate Feedback 1
     feedback1 = "Correction: The submission due date has been extended to February 28, 2026."
-    print("\n" + "-"*50)
-    print(f"INJECTING FEEDBACK 1: {feedback1}")
-    print("-"*50)
+    banner(f"INJECTING FEEDBACK 1: {feedback1}", "-")
     
     # Store feedback in memory
     # We store it associated with the RFP content so it's retrieved next time
-    memory_service.add_long_term(
+    feedback_task = asyncio.create_task(asyncio.to_thread(
+        memory_service.add_long_term,
         f"User Feedback for AI Transformation Initiative: {feedback1}",
         user_id=user_id
-    )
+    ))
     
-    # Wait a bit for indexing (simulated)
-    print("Memory updating...")
-    await asyncio.sleep(5)
+    report.info("Memory updating...")
+    try:
+        res = await simple_memory_task
+        logger.info(f"Simple memory add result: {res}")
+    except Exception as e:
+        logger.error(f"Simple memory add failed: {e}")
+    # Round 2 depends on feedback 1, so wait for the write to finish and become searchable
+    await feedback_task
+    await wait_indexed(memory_service, "February 28", user_id)
     
-    print("\n" + "="*50)
-    print("ROUND 2: EXTRACTION WITH MEMORY (After Feedback 1)")
-    print("="*50)
+    banner("ROUND 2: EXTRACTION WITH MEMORY (After Feedback 1)")
     
     result2 = await agent.extract(RFP_TEXT, user_id=user_id)
-    print(f"Extracted Due Date: {result2.get('submission_due_date')}")
-    print(f"Extracted Owner: {result2.get('client_pursuit_owner_name')}")
+    report.info(f"Extracted Due Date: {result2.get('submission_due_date')}")
+    report.info(f"Extracted Owner: {result2.get('client_pursuit_owner_name')}")
     
     # Simulate Feedback 2
     feedback2 = "Correction: The client contact is actually John Smith, not Jane Doe."
-    print("\n" + "-"*50)
-    print(f"INJECTING FEEDBACK 2: {feedback2}")
-    print("-"*50)
+    banner(f"INJECTING FEEDBACK 2: {feedback2}", "-")
     
-    memory_service.add_long_term(
+    await asyncio.to_thread(
+        memory_service.add_long_term,
         f"User Feedback for AI Transformation Initiative: {feedback2}",
         user_id=user_id
     )
     
-    await asyncio.sleep(5)
+    await wait_indexed(memory_service, "John Smith", user_id)
     
-    print("\n" + "="*50)
-    print("ROUND 3: EXTRACTION WITH ACCUMULATED MEMORY (After Feedback 2)")
-    print("="*50)
+    banner("ROUND 3: EXTRACTION WITH ACCUMULATED MEMORY (After Feedback 2)")
     
     result3 = await agent.extract(RFP_TEXT, user_id=user_id)
-    print(f"Extracted Due Date: {result3.get('submission_due_date')}")
-    print(f"Extracted Owner: {result3.get('client_pursuit_owner_name')}")
+    report.info(f"Extracted Due Date: {result3.get('submission_due_date')}")
+    report.info(f"Extracted Owner: {result3.get('client_pursuit_owner_name')}")
     
-    print("\n" + "="*50)
-    print("SUMMARY OF IMPROVEMENT")
-    print("="*50)
-    print(f"Round 1 Due Date: {result1.get('submission_due_date')} (Original)")
-    print(f"Round 2 Due Date: {result2.get('submission_due_date')} (After Feedback 1)")
-    print(f"Round 3 Due Date: {result3.get('submission_due_date')} (Should persist)")
-    print(f"Round 1 Owner:    {result1.get('client_pursuit_owner_name')} (Original)")
-    print(f"Round 3 Owner:    {result3.get('client_pursuit_owner_name')} (After Feedback 2)")
+    banner("SUMMARY OF IMPROVEMENT")
+    report.info(f"Round 1 Due Date: {result1.get('submission_due_date')} (Original)")
+    report.info(f"Round 2 Due Date: {result2.get('submission_due_date')} (After Feedback 1)")
+    report.info(f"Round 3 Due Date: {result3.get('submission_due_date')} (Should persist)")
+    report.info(f"Round 1 Owner:    {result1.get('client_pursuit_owner_name')} (Original)")
+    report.info(f"Round 3 Owner:    {result3.get('client_pursuit_owner_name')} (After Feedback 2)")
+    report_handler.flush()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -6,8 +6,12 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.services.ai_service.llm_service import LLMService
-from app.services.ai_service.gap_analysis_agent import GapAnalysisAgent
+from app.services.ai_service._singletons import get_gap_analysis_agent
+
+def print_numbered(items):
+    """Print items as a numbered list in a single write."""
+    if items:
+        print("\n".join(f"  {i}. {item}" for i, item in enumerate(items, 1)))
 
 async def test_gap_edit():
     """Test the gap analysis editing workflow"""
@@ -39,8 +43,7 @@ async def test_gap_edit():
     print("=" * 80)
 
     # Initialize services
-    llm_service = LLMService()
-    agent = GapAnalysisAgent(llm_service)
+    agent = get_gap_analysis_agent()
 
     # Run gap analysis
     print("\n1. Running initial gap analysis...")
@@ -48,12 +51,10 @@ async def test_gap_edit():
 
     print("\n✅ Initial Analysis Complete:")
     print(f"\nIdentified Gaps ({len(result['gaps'])}):")
-    for i, gap in enumerate(result['gaps'], 1):
-        print(f"  {i}. {gap}")
+    print_numbered(result['gaps'])
 
     print(f"\nSearch Queries ({len(result['search_queries'])}):")
-    for i, query in enumerate(result['search_queries'], 1):
-        print(f"  {i}. {query}")
+    print_numbered(result['search_queries'])
 
     print(f"\nReasoning:")
     print(f"  {result['reasoning']}")
@@ -71,12 +72,10 @@ async def test_gap_edit():
 
     print("\n✅ Edited Analysis:")
     print(f"\nIdentified Gaps ({len(edited_result['gaps'])}):")
-    for i, gap in enumerate(edited_result['gaps'], 1):
-        print(f"  {i}. {gap}")
+    print_numbered(edited_result['gaps'])
 
     print(f"\nSearch Queries ({len(edited_result['search_queries'])}):")
-    for i, query in enumerate(edited_result['search_queries'], 1):
-        print(f"  {i}. {query}")
+    print_numbered(edited_result['search_queries'])
 
     print("\n" + "=" * 80)
     print("✅ Test Complete - Gap Analysis Editing Logic Works!")
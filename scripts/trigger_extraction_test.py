@@ -1,14 +1,29 @@
+import mmap
+import os
 import requests
 import sys
 
 API_URL = "http://localhost:8000/api/v1"
 EMAIL = "test@example.com"
 PASSWORD = "password123"
+RFP_PATH = "dummy_rfp.txt"
 
 def main():
+    # One session for every call so they share a keep-alive connection. The RFP is
+    # memory-mapped rather than read up front: requests copies it into the multipart
+    # body once, straight from the page cache, instead of from a second in-memory copy.
+    with requests.Session() as session, open(RFP_PATH, 'rb') as f:
+        # mmap refuses to map an empty file, so an empty RFP is sent as plain bytes
+        if os.fstat(f.fileno()).st_size == 0:
+            run(session, b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as rfp:
+            run(session, rfp)
+
+def run(session, rfp):
     # 1. Login
     print("Logging in...")
-    resp = requests.post(f"{API_URL}/auth/login", data={"username": EMAIL, "password": PASSWORD})
+    resp = session.post(f"{API_URL}/auth/login", data={"username": EMAIL, "password": PASSWORD})
     if resp.status_code != 200:
         print(f"Login failed: {resp.text}")
         sys.exit(1)
@@ -18,7 +33,7 @@ def main():
 
     # 2. Get the pursuit (assuming the one created by subagent exists)
     # We'll just list pursuits and pick the last one
-    resp = requests.get(f"{API_URL}/pursuits/", headers=headers)
+    resp = session.get(f"{API_URL}/pursuits/", headers=headers)
     pursuits = resp.json()
     if not pursuits:
         print("No pursuits found.")
@@ -30,9 +45,9 @@ def main():
 
     # 3. Upload File
     print("Uploading file...")
-    files = {'file': open('dummy_rfp.txt', 'rb')}
+    files = {'file': (RFP_PATH, rfp, 'text/plain')}
     data = {'file_type': 'rfp'}
-    resp = requests.post(f"{API_URL}/pursuits/{pursuit_id}/files", headers=headers, files=files, data=data)
+    resp = session.post(f"{API_URL}/pursuits/{pursuit_id}/files", headers=headers, files=files, data=data)
     if resp.status_code != 200:
         print(f"Upload failed: {resp.text}")
         sys.exit(1)
@@ -40,7 +55,7 @@ def main():
 
     # 4. Trigger Extraction
     print("Triggering extraction...")
-    resp = requests.post(f"{API_URL}/pursuits/{pursuit_id}/extract", headers=headers)
+    resp = session.post(f"{API_URL}/pursuits/{pursuit_id}/extract", headers=headers)
     if resp.status_code != 200:
         print(f"Extraction failed: {resp.text}")
         sys.exit(1)
@@ -1,113 +1,113 @@
-import urllib.request
-import urllib.parse
-import urllib.error
-import json
+import asyncio
 import time
 import sys
+import httpx
 
 BACKEND_URL = "http://localhost:8000/api/v1"
 FRONTEND_URL = "http://localhost:3000"
 
-def wait_for_service(url, name, timeout=60):
+async def wait_for_service(client, url, name, timeout=60):
     print(f"Waiting for {name} at {url}...")
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+    deadline = time.monotonic() + timeout
+    # Start probing quickly and back off, so a fast start is noticed within ~50ms
+    delay = 0.05
+    while time.monotonic() < deadline:
         try:
-            with urllib.request.urlopen(url) as response:
-                if response.status == 200:
-                    print(f"{name} is up!")
-                    return True
-        except urllib.error.URLError:
+            # HEAD: readiness only needs the status, not the body
+            response = await client.head(url)
+            if response.status_code == 200:
+                print(f"{name} is up!")
+                return True
+        except httpx.HTTPError:
             pass
-        except Exception as e:
-            pass
-        time.sleep(1)
+        await asyncio.sleep(delay)
+        delay = min(delay * 1.5, 1.0)
     print(f"{name} failed to start.")
     return False
 
-def make_request(method, url, data=None, headers=None):
+async def wait_for_services():
+    # Backend and frontend start independently, so probe both at once. The frontend
+    # root redirects to /login, so redirects are followed to reach a final status.
+    async with httpx.AsyncClient(follow_redirects=True) as client:
+        results = await asyncio.gather(
+            wait_for_service(client, "http://localhost:8000/health", "Backend"),
+            wait_for_service(client, FRONTEND_URL, "Frontend"),
+        )
+    return all(results)
+
+def make_request(client, method, url, data=None, headers=None):
     if headers is None:
         headers = {}
     
-    encoded_data = None
-    if data:
+    try:
         if headers.get('Content-Type') == 'application/x-www-form-urlencoded':
-            encoded_data = urllib.parse.urlencode(data).encode('utf-8')
+            response = client.request(method, url, data=data, headers=headers)
         else:
             # Default to JSON
-            encoded_data = json.dumps(data).encode('utf-8')
-            headers['Content-Type'] = 'application/json'
-    
-    req = urllib.request.Request(url, data=encoded_data, headers=headers, method=method)
-    try:
-        with urllib.request.urlopen(req) as response:
-            body = response.read().decode('utf-8')
-            status = response.status
-            try:
-                json_body = json.loads(body) if body else {}
-            except:
-                json_body = body
-            return status, json_body
-    except urllib.error.HTTPError as e:
-        body = e.read().decode('utf-8')
-        return e.code, body
-    except Exception as e:
+            response = client.request(method, url, json=data, headers=headers)
+    except httpx.HTTPError as e:
         return 0, str(e)
 
+    try:
+        body = response.json() if response.content else {}
+    except ValueError:
+        body = response.text
+    return response.status_code, body
+
 def verify_full_stack():
     # 1. Check Health
-    if not wait_for_service("http://localhost:8000/health", "Backend"):
-        sys.exit(1)
-    if not wait_for_service(FRONTEND_URL, "Frontend"):
+    if not asyncio.run(wait_for_services()):
         sys.exit(1)
 
-    # 2. Login
-    print("Testing Login...")
-    login_data = {
-        "username": "test@example.com",
-        "password": "password123"
-    }
-    status, response = make_request("POST", f"{BACKEND_URL}/auth/login", login_data, {"Content-Type": "application/x-www-form-urlencoded"})
-    
-    if status != 200:
-        print(f"Login failed: {status} {response}")
-        sys.exit(1)
-    
-    token = response["access_token"]
-    headers = {"Authorization": f"Bearer {token}"}
-    print("Login successful.")
+    # One client for the remaining calls, so they share a keep-alive connection
+    with httpx.Client() as client:
+        # 2. Login
+        print("Testing Login...")
+        login_data = {
+            "username": "test@example.com",
+            "password": "password123"
+        }
+        status, response = make_request(client, "POST", f"{BACKEND_URL}/auth/login", login_data, {"Content-Type": "application/x-www-form-urlencoded"})
+        
+        if status != 200:
+            print(f"Login failed: {status} {response}")
+            sys.exit(1)
+        
+        token = response["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        print("Login successful.")
 
-    # 3. Create Pursuit
-    print("Testing Create Pursuit...")
-    pursuit_data = {
-        "entity_name": "Integration Test Corp",
-        "internal_pursuit_owner_name": "Test Agent",
-        "status": "draft"
-    }
-    status, response = make_request("POST", f"{BACKEND_URL}/pursuits/", pursuit_data, headers)
-    
-    if status != 200:
-        print(f"Create Pursuit failed: {status} {response}")
-        sys.exit(1)
-    
-    pursuit_id = response["id"]
-    print(f"Pursuit created with ID: {pursuit_id}")
+        # 3. Create Pursuit
+        print("Testing Create Pursuit...")
+        pursuit_data = {
+            "entity_name": "Integration Test Corp",
+            "internal_pursuit_owner_name": "Test Agent",
+            "status": "draft"
+        }
+        status, response = make_request(client, "POST", f"{BACKEND_URL}/pursuits/", pursuit_data, headers)
+        
+        if status != 200:
+            print(f"Create Pursuit failed: {status} {response}")
+            sys.exit(1)
+        
+        pursuit_id = response["id"]
+        print(f"Pursuit created with ID: {pursuit_id}")
 
-    # 4. List Pursuits
-    print("Testing List Pursuits...")
-    status, response = make_request("GET", f"{BACKEND_URL}/pursuits/", None, headers)
-    
-    if status != 200:
-        print(f"List Pursuits failed: {status} {response}")
-        sys.exit(1)
-    
-    pursuits = response
-    if len(pursuits) == 0:
-        print("List Pursuits returned empty list.")
-        sys.exit(1)
-    
-    print(f"Found {len(pursuits)} pursuits.")
-    print("Full stack verification passed!")
+        # 4. List Pursuits
+        print("Testing List Pursuits...")
+        status, response = make_request(client, "GET", f"{BACKEND_URL}/pursuits/", None, headers)
+        
+        if status != 200:
+            print(f"List Pursuits failed: {status} {response}")
+            sys.exit(1)
+        
+        pursuits = response
+        if len(pursuits) == 0:
+            print("List Pursuits returned empty list.")
+            sys.exit(1)
+        
+        print(f"Found {len(pursuits)} pursuits.")
+        print("Full stack verification passed!")
 
 if __name__ == "__main__":
     verify_full_stack()
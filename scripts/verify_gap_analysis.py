@@ -1,94 +1,141 @@
+import io
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import logging
+import random
 import time
-import json
+import orjson
 
 BASE_URL = "http://localhost:8000/api/v1"
+HEALTH_URL = "http://localhost:8000/health"
 EMAIL = "test@example.com"
 PASSWORD = "password123"
+POLL_TIMEOUT_SECONDS = 60
+# uvicorn closes idle keep-alive connections after 5s by default; staying under that
+# means every poll reuses the session's open connection instead of reconnecting
+POLL_MAX_DELAY_SECONDS = 4.0
+RFP_BODY = b"This is a test RFP for a software project. We need a web application with React and Python. The budget is $100,000. Due date is 2025-12-31."
+# Gap analysis template, serialized once rather than on every request
+TEMPLATE_BODY = orjson.dumps({
+    "title": "Test Template",
+    "description": "A test template",
+    "details": ["1. Executive Summary", "2. Technical Approach", "3. Pricing"]
+})
 
-def login():
-    response = requests.post(f"{BASE_URL}/auth/login", data={"username": EMAIL, "password": PASSWORD})
+logger = logging.getLogger(__name__)
+
+def create_session():
+    # Every call goes to the same host, so a small pool is enough to keep the
+    # connection alive across steps and poll iterations. Transient gateway errors are
+    # retried with backoff; urllib3 only retries idempotent methods, so POSTs that
+    # create or trigger work are never repeated.
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504))
+    session = requests.Session()
+    session.mount("http://localhost", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+    # The backend gzips larger JSON responses; requests decodes them transparently
+    session.headers["Accept-Encoding"] = "gzip, deflate"
+    return session
+
+def _call(session, method, path, **kwargs):
+    response = session.request(method, f"{BASE_URL}{path}", **kwargs)
     response.raise_for_status()
-    return response.json()["access_token"]
+    return response
+
+def preconnect(session):
+    # Open the pooled connection before login so connection setup stays off the
+    # critical path; the response itself doesn't matter
+    try:
+        session.head(HEALTH_URL, timeout=5)
+    except requests.RequestException:
+        pass
+
+def login(session):
+    response = _call(session, "POST", "/auth/login", data={"username": EMAIL, "password": PASSWORD})
+    token = orjson.loads(response.content)["access_token"]
+    session.headers.update({"Authorization": f"Bearer {token}"})
+    return token
 
-def create_pursuit(token):
-    headers = {"Authorization": f"Bearer {token}"}
+def create_pursuit(session):
     data = {"entity_name": "Test Client", "expected_format": "docx"}
-    response = requests.post(f"{BASE_URL}/pursuits/", json=data, headers=headers)
-    response.raise_for_status()
-    return response.json()
-
-def upload_file(token, pursuit_id):
-    headers = {"Authorization": f"Bearer {token}"}
-    # Create a dummy PDF file
-    with open("dummy_rfp.txt", "w") as f:
-        f.write("This is a test RFP for a software project. We need a web application with React and Python. The budget is $100,000. Due date is 2025-12-31.")
-    
-    files = {"file": ("dummy_rfp.txt", open("dummy_rfp.txt", "rb"))}
-    data = {"file_type": "rfp"}
-    response = requests.post(f"{BASE_URL}/pursuits/{pursuit_id}/files", files=files, data=data, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return orjson.loads(_call(session, "POST", "/pursuits/", json=data).content)
 
-def trigger_extraction(token, pursuit_id):
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.post(f"{BASE_URL}/pursuits/{pursuit_id}/extract", headers=headers)
-    response.raise_for_status()
-    return response.json()
-
-def trigger_gap_analysis(token, pursuit_id):
-    headers = {"Authorization": f"Bearer {token}"}
-    template_details = {
-        "title": "Test Template",
-        "description": "A test template",
-        "details": ["1. Executive Summary", "2. Technical Approach", "3. Pricing"]
-    }
-    response = requests.post(f"{BASE_URL}/pursuits/{pursuit_id}/gap-analysis", json=template_details, headers=headers)
-    response.raise_for_status()
-    return response.json()
+def upload_file(session, pursuit_id):
+    # The dummy RFP is sent straight from memory; nothing is written to disk
+    files = {"file": ("dummy_rfp.txt", io.BytesIO(RFP_BODY), "text/plain")}
+    _call(session, "POST", f"/pursuits/{pursuit_id}/files", files=files, data={"file_type": "rfp"})
 
-def get_pursuit(token, pursuit_id):
-    headers = {"Authorization": f"Bearer {token}"}
-    response = requests.get(f"{BASE_URL}/pursuits/{pursuit_id}", headers=headers)
-    response.raise_for_status()
-    return response.json()
+def trigger_extraction(session, pursuit_id):
+    _call(session, "POST", f"/pursuits/{pursuit_id}/extract")
+
+def trigger_gap_analysis(session, pursuit_id):
+    response = _call(
+        session, "POST", f"/pursuits/{pursuit_id}/gap-analysis",
+        data=TEMPLATE_BODY,
+        headers={"Content-Type": "application/json"}
+    )
+    return orjson.loads(response.content)
+
+def gap_analysis_ready(session, pursuit_id):
+    return orjson.loads(_call(session, "GET", f"/pursuits/{pursuit_id}/gap-analysis/status").content)["ready"]
+
+def get_pursuit(session, pursuit_id):
+    return orjson.loads(_call(session, "GET", f"/pursuits/{pursuit_id}").content)
 
 def main():
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     try:
-        print("Logging in...")
-        token = login()
-        
-        print("Creating pursuit...")
-        pursuit = create_pursuit(token)
-        pursuit_id = pursuit["id"]
-        print(f"Pursuit created: {pursuit_id}")
-        
-        print("Uploading file...")
-        upload_file(token, pursuit_id)
-        
-        print("Triggering extraction...")
-        trigger_extraction(token, pursuit_id)
-        
-        # Wait for extraction (it's fast for dummy text, but let's give it a second)
-        time.sleep(2)
-        
-        print("Triggering gap analysis...")
-        trigger_gap_analysis(token, pursuit_id)
-        
-        print("Polling for results...")
-        for i in range(30):
-            p = get_pursuit(token, pursuit_id)
-            if p.get("gap_analysis_result"):
-                print("Gap Analysis Result found!")
-                print(json.dumps(p["gap_analysis_result"], indent=2))
-                return
-            print(f"Waiting... ({i+1}/30)")
-            time.sleep(2)
-            
-        print("Timeout waiting for gap analysis result.")
-        
+        with create_session() as session:
+            run(session)
     except Exception as e:
-        print(f"Error: {e}")
+        logger.error(f"Error: {e}")
+
+def run(session):
+    preconnect(session)
+
+    logger.info("Logging in...")
+    login(session)
+
+    logger.info("Creating pursuit...")
+    pursuit = create_pursuit(session)
+    pursuit_id = pursuit["id"]
+    logger.info(f"Pursuit created: {pursuit_id}")
+
+    logger.info("Uploading file...")
+    upload_file(session, pursuit_id)
+
+    # Extraction runs inside the request, so gap analysis can start as soon as it returns
+    logger.info("Triggering extraction...")
+    trigger_extraction(session, pursuit_id)
+
+    # Gap analysis also runs inside the request, and the response carries the result,
+    # so polling is only a fallback for when it isn't there yet
+    logger.info("Triggering gap analysis...")
+    pursuit = trigger_gap_analysis(session, pursuit_id)
+    result = pursuit.get("gap_analysis_result") or wait_for_gap_analysis(session, pursuit_id)
+    if result:
+        logger.info("Gap Analysis Result found!")
+        # The result itself is the script's output, so it goes to stdout
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2).decode())
+    else:
+        logger.info("Timeout waiting for gap analysis result.")
+
+def wait_for_gap_analysis(session, pursuit_id):
+    logger.info("Polling for results...")
+    # Back off from a short first delay so fast runs are noticed quickly, within the
+    # same overall time budget
+    deadline = time.monotonic() + POLL_TIMEOUT_SECONDS
+    delay = 0.05
+    while time.monotonic() < deadline:
+        # Poll the small status endpoint; the full pursuit is only fetched once ready
+        if gap_analysis_ready(session, pursuit_id):
+            return get_pursuit(session, pursuit_id)["gap_analysis_result"]
+        # Jitter the delay so concurrent verifier runs don't poll in lockstep
+        sleep_for = delay * (1 + random.uniform(-0.15, 0.15))
+        logger.info(f"Waiting... (next check in {sleep_for:.2f}s)")
+        time.sleep(sleep_for)
+        delay = min(delay * 1.3, POLL_MAX_DELAY_SECONDS)
+    return None
 
 if __name__ == "__main__":
     main()
@@ -1,23 +1,36 @@
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from mem0 import Memory
 from app.core.config import settings
 import json
 
+# Facts the agent is expected to have stored about the test RFP
+QUERIES = ["AI Platform", "budget", "due date", "React"]
+
+@functools.lru_cache(maxsize=1)
+def _memory() -> Memory:
+    # Same config as the agent. Built once per process, since mem0 sets up its vector
+    # store, embedder and LLM clients on init
+    return Memory.from_config(settings.MEM0_CONFIG)
+
 def verify_memory():
     print("Verifying agent memory persistence...")
     try:
-        # Initialize memory with same config as agent
-        m = Memory.from_config(settings.MEM0_CONFIG)
-        
-        # Search for the memory stored by the agent
-        # The agent stores it with user_id="agent_memory_user"
-        results = m.search("AI Platform", user_id="agent_memory_user")
+        m = _memory()
+        # mem0 searches one query at a time (embed + vector query), so run them
+        # concurrently rather than waiting on each round trip in turn
+        # The agent stores memories with user_id="agent_memory_user"
+        with ThreadPoolExecutor(max_workers=len(QUERIES)) as pool:
+            all_results = list(pool.map(lambda q: m.search(q, user_id="agent_memory_user"), QUERIES))
         
-        if results:
-            print(f"SUCCESS: Found {len(results)} memory items.")
-            for res in results:
-                print(f"- {res}")
-        else:
-            print("FAILURE: No memory items found for 'agent_memory_user'.")
+        for query, results in zip(QUERIES, all_results):
+            print(f"\nQuery: '{query}'")
+            if results:
+                print(f"SUCCESS: Found {len(results)} memory items.")
+                for res in results:
+                    print(f"- {res}")
+            else:
+                print("FAILURE: No memory items found for 'agent_memory_user'.")
             
     except Exception as e:
         print(f"Error verifying memory: {e}")